@@ -0,0 +1,6 @@
+from .suite import runSuite, compareResults, scalingReport, importTime
+from .checks import runChecks
+
+__all__ = [
+    'runSuite', 'compareResults', 'scalingReport', 'importTime', 'runChecks'
+]
@@ -0,0 +1,304 @@
+'''
+Consistency checks of fast paths against their reference versions.
+
+    python -m rollerpy.benchmarks check
+'''
+import shutil
+import tempfile
+
+import numpy as np
+
+from rollerpy.funcs import (
+    curveByCurve, frenetFromPfuncs, frenetFrames, rotationMinimizingFrames,
+    SpatialIndex, AffineTransform
+)
+from rollerpy.funcs.spatial import pointsSegmentsDistance
+from rollerpy.funcs.tools import _curveByCurvePointwise
+from rollerpy.models import (
+    Line, Hill, DoubleLoop, Track, saveTrack, loadTrack, CurveCache,
+    layoutChunks, layoutTrack
+)
+
+from .suite import _baseSplines, _OVERLAY, _hillTrackSegments
+
+
+def _curveByCurve():
+    '''
+    Batched curveByCurve against point by point reference
+    on spline base curve.
+    '''
+    t = np.linspace(0, 1, 500)
+    base = _baseSplines()
+    batched = curveByCurve(t, base, _OVERLAY)
+    reference = _curveByCurvePointwise(t, base, _OVERLAY)
+    return np.abs(np.array(batched) - np.array(reference)).max()
+
+
+def _frenetFrames():
+    '''
+    Batched frenet's frames against point by point
+    frenetFromPfuncs on spline base curve.
+    '''
+    t = np.linspace(0.05, 0.95, 200)
+    base = _baseSplines()
+    batched = np.array(frenetFrames(t, base))
+    reference = np.array([frenetFromPfuncs(point, *base) for point in t])
+    return np.abs(batched - reference.transpose(1, 0, 2)).max()
+
+
+def _reflect(vector, normal):
+    c = np.dot(normal, normal)
+    if c == 0:
+        return vector
+    return vector - 2*np.dot(normal, vector)/c*normal
+
+
+def _rotationMinimizingFrames():
+    '''
+    Rotation minimizing frames (prefix products of reflections)
+    against double reflection done sample by sample.
+    '''
+    loop = DoubleLoop(20, 10, 8, 30, single_e_n=100)
+    points = np.array([loop.x, loop.y, loop.z]).T
+    tangents = np.array([loop.dx, loop.dy, loop.dz]).T
+    p, n, b = rotationMinimizingFrames(points, tangents)
+
+    unit = tangents/np.linalg.norm(tangents, axis=1)[:, None]
+    reference = np.empty_like(n)
+    reference[0] = n[0]
+    for i in range(1, len(unit)):
+        chord = points[i] - points[i - 1]
+        normal = _reflect(reference[i - 1], chord)
+        tangent = _reflect(unit[i - 1], chord)
+        normal = _reflect(normal, unit[i] - tangent)
+        reference[i] = normal/np.linalg.norm(normal)
+    return max(
+        np.abs(n - reference).max(),
+        np.abs(p - unit).max(),
+        np.abs(b - np.cross(unit, reference)).max()
+    )
+
+
+def _spatialIndex():
+    '''
+    Nearest samples and clearance from KD-tree against brute force
+    distances to all samples and polyline segments.
+    '''
+    loop = DoubleLoop(20, 10, 8, 30, single_e_n=100)
+    track = np.array([loop.x, loop.y, loop.z]).T
+    points = track[::7] + np.random.default_rng(0).normal(
+        scale=2, size=(len(track[::7]), 3)
+    )
+    index = SpatialIndex(track.T)
+
+    samples = np.linalg.norm(points[:, None] - track, axis=2).min(axis=1)
+    segments = np.array([
+        pointsSegmentsDistance(
+            np.broadcast_to(point, track[1:].shape), track[:-1], track[1:]
+        ).min()
+        for point in points
+    ])
+    return max(
+        np.abs(index.nearest(points)[0] - samples).max(),
+        np.abs(index.clearance(points) - segments).max()
+    )
+
+
+def _layoutChunks():
+    '''
+    Chunks of layout samples joined together against Track with
+    all layout curves. Chunk derivatives are in parameters of layout
+    curves, so only their directions are compared.
+    '''
+    hill = {
+        'l_e1': 30, 'l_e2': 40, 'h': 25,
+        'lamb_s': 60, 'lamb_m': 50, 'lamb_e': 60
+    }
+    layout = {
+        'start': {'point': [5, 0, 0], 'tangent': [0, 1, 0]},
+        'elements': [
+            {'type': 'Hill', 'parameters': hill, 'repeat': 2},
+            {
+                'type': 'SingleLoop',
+                'parameters': {'h': 20, 'A': 10, 'B': 8, 'lw': 30},
+                'placement': [{'mirror': 'y'}]
+            },
+            {'type': 'Hill', 'parameters': hill, 'align': 'tangent'}
+        ]
+    }
+    chunks = list(zip(*layoutChunks(layout, chunk=50)))
+    points = np.concatenate(chunks[0], axis=1)
+    derivatives = np.concatenate(chunks[1], axis=1)
+    track = _arrays(layoutTrack(layout))
+    if points.shape != track[:3].shape:
+        return np.inf
+
+    def unit(vectors):
+        return vectors/np.linalg.norm(vectors, axis=0)
+    return max(
+        np.abs(points - track[:3]).max(),
+        np.abs(unit(derivatives) - unit(track[3:])).max()
+    )
+
+
+def _arrays(curve):
+    return np.array([curve.x, curve.y, curve.z, curve.dx, curve.dy, curve.dz])
+
+
+def _incrementalEdit():
+    '''
+    Curves edited in place (only changed segments are calculated
+    again) against curves built from scratch with edited parameters.
+    '''
+    track = Track(_hillTrackSegments(4, single_e_n=100))
+    loop = DoubleLoop(20, 10, 8, 30, single_e_n=100)
+    for curve in (track, loop):
+        curve.dx
+    track.setSegmentParameters(2, lamb_m=40)
+    loop.setParameters(A=12)
+
+    segments = _hillTrackSegments(4, single_e_n=100)
+    segments[2].setParameters(lamb_m=40)
+    return max(
+        np.abs(_arrays(edited) - _arrays(built)).max()
+        for edited, built in (
+            (track, Track(segments)),
+            (loop, DoubleLoop(20, 12, 8, 30, single_e_n=100))
+        )
+    )
+
+
+def _storeRoundTrip():
+    '''
+    Track of placed segments, rotated as a whole, against its stored
+    arrays and curve rebuilt from stored parameters.
+    '''
+    track = Track(_hillTrackSegments(3)).rotate(0.5)
+    directory = tempfile.mkdtemp()
+    try:
+        saveTrack(track, directory)
+        stored = loadTrack(directory)
+        return max(
+            np.abs(_arrays(track) - _arrays(curve)).max()
+            for curve in (stored, stored.rebuild())
+        )
+    finally:
+        shutil.rmtree(directory)
+
+
+def _cacheDiskHit():
+    '''
+    Curve from disk cache against the same curve built by cache
+    miss, they have to be of the same class and evaluate the same.
+    '''
+    segments = _hillTrackSegments(3)
+    t = np.linspace(0, 1, 7)
+    directory = tempfile.mkdtemp()
+    try:
+        built = CurveCache(directory=directory).build(Track, segments)
+        disk = CurveCache(directory=directory).build(Track, segments)
+        if type(disk) is not type(built):
+            return np.inf
+        return max(
+            np.abs(_arrays(built) - _arrays(disk)).max(),
+            np.abs(built.evaluate(t, 1) - disk.evaluate(t, 1)).max()
+        )
+    finally:
+        shutil.rmtree(directory)
+
+
+def _cacheHitIsolation():
+    '''
+    Cache hit changed in every way (segment parameters, transform,
+    row) against other hit of the same curve, which must not change.
+    '''
+    cache = CurveCache()
+    segments = _hillTrackSegments(3)
+    original = _arrays(cache.build(Track, segments))
+    edited = cache.build(Track, segments)
+    edited.setSegmentParameters(1, lamb_m=40)
+    edited.rotate(0.5)
+    edited.x = np.zeros(len(edited.x))
+    return max(
+        np.abs(_arrays(curve) - original).max()
+        for curve in (cache.build(Track, segments), Track(segments))
+    )
+
+
+def _transformChain():
+    '''
+    Curve moved by many transforms (read after every one) and moved
+    back against its original arrays, transforms are applied to clean
+    arrays so they have to be the same.
+    '''
+    hill = Hill(30, 40, 25, 60, 50, 60)
+    original = _arrays(hill)
+    for _ in range(100):
+        hill.rotate(0.37, center=[3, 1, 2]).translate([1, 2, 3])
+        hill.x
+        hill.dx
+    hill.setTransform(AffineTransform())
+    return np.abs(_arrays(hill) - original).max()
+
+
+def _rowWrite():
+    '''
+    Row written (in curve's own coordinates) to placed curve
+    against transformed block with that row.
+    '''
+    line = Line([0, 0, 0], [3, 4, 5], n=50)
+    line.rotate(0.5, axis='x').translate([10, 0, 0])
+    own = np.array([line.x, line.y, line.z])
+    own = line.returnTransform().inverse().applyPoints(own)
+    own[0] = np.linspace(-1, 1, 50)
+    line.x = own[0]
+    expected = line.returnTransform().applyPoints(own)
+    return np.abs(np.array([line.x, line.y, line.z]) - expected).max()
+
+
+def _indexAccessors():
+    '''
+    Integer index accessors of points and derivatives
+    against curve arrays.
+    '''
+    hill = Hill(30, 40, 25, 60, 50, 60).translate([5, 0, 0])
+    points, derivatives = _arrays(hill)[:3], _arrays(hill)[3:]
+    unit = derivatives[:, 3]/np.linalg.norm(derivatives[:, 3])
+    return max(
+        np.abs(hill.gimmePoint(3) - points[:, 3]).max(),
+        np.abs(hill.gimmeDerivative(3) - derivatives[:, 3]).max(),
+        np.abs(hill.gimmeDerivativeUnitVector(3) - unit).max(),
+        np.abs(hill.returnFirstPoint() - points[:, 0]).max(),
+        np.abs(hill.returnLastDerivative() - derivatives[:, -1]).max()
+    )
+
+
+# name, tolerance, func returning largest difference
+CHECKS = [
+    ('curveByCurve.batched', 1e-5, _curveByCurve),
+    ('setParameters.incremental', 1e-9, _incrementalEdit),
+    ('store.roundTrip', 1e-9, _storeRoundTrip),
+    ('cache.diskHit', 1e-9, _cacheDiskHit),
+    ('cache.hitIsolation', 0, _cacheHitIsolation),
+    ('transform.chain', 0, _transformChain),
+    ('curve.rowWrite', 1e-9, _rowWrite),
+    ('curve.indexAccessors', 0, _indexAccessors),
+    ('frenetFrames.batched', 1e-5, _frenetFrames),
+    ('rotationMinimizingFrames', 1e-9, _rotationMinimizingFrames),
+    ('spatialIndex', 1e-9, _spatialIndex),
+    ('layoutChunks', 1e-12, _layoutChunks),
+]
+
+
+def runChecks(names=None):
+    '''
+    Runs checks (all or given by names). Returns list of
+    (name, difference, tolerance, passed).
+    '''
+    results = []
+    for name, tolerance, func in CHECKS:
+        if names and name not in names:
+            continue
+        difference = func()
+        results.append((name, difference, tolerance, difference <= tolerance))
+    return results
@@ -0,0 +1,334 @@
+'''
+Benchmarks of funcs hot paths and every curve class.
+
+    python -m rollerpy.benchmarks run -o new.json
+    python -m rollerpy.benchmarks compare old.json new.json
+    python -m rollerpy.benchmarks scaling new.json
+    python -m rollerpy.benchmarks check
+
+Cold import time of IMPORTS is measured in fresh interpreters.
+'''
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+from rollerpy import __version__
+from rollerpy.funcs import (
+    trackTransitonCurve, frenetFromPfuncs, curveByCurve
+)
+from rollerpy.models import (
+    HelixCircleParam, InvHelixCircleParam, Line,
+    SingleLoop, DoubleLoop, Hill, TransitionHelix, Track
+)
+
+_LADDER = (100, 1000, 10000, 100000)
+_SHORT_LADDER = (10, 100, 1000)
+_SUPERLINEAR = 1.2
+
+
+def _build(curveClass, *args, **kwargs):
+    '''
+    Returns func building curve with all its arrays.
+    '''
+    def func():
+        curve = curveClass(*args, **kwargs)
+        curve.x
+        curve.dx
+    return func
+
+
+def _baseSplines():
+    t = np.linspace(0, 1, 20)
+    return tuple(
+        CubicSpline(t, values)
+        for values in (np.cos(3*t), np.sin(3*t), t**2)
+    )
+
+
+_OVERLAY = (
+    lambda t: 2*np.cos(5*t),
+    lambda t: t,
+    lambda t: np.sin(5*t)
+)
+
+
+def _frenetCalls(n):
+    base = _baseSplines()
+    t = np.linspace(0, 1, n)
+
+    def func():
+        for point in t:
+            frenetFromPfuncs(point, *base)
+    return func
+
+
+def _hillTrackSegments(k, **kwargs):
+    '''
+    Returns k hills placed one after another along x axis.
+    '''
+    return [
+        Hill(30, 40, 25, 60, 50, 60, **kwargs).translate([70*i, 0, 0])
+        for i in range(k)
+    ]
+
+
+def _track(n):
+    return _build(Track, [
+        Hill(30, 40, 25, 60, 50, 60, single_e_n=n),
+        SingleLoop(20, 10, 8, 30, single_e_n=n)
+    ])
+
+
+def _trackEdit(n):
+    '''
+    Returns func changing parameter of one segment of built
+    track with n segments (time should not depend on n).
+    '''
+    track = Track(_hillTrackSegments(n, single_e_n=100))
+    track.dx
+    values = iter(np.tile([55, 50], 100))
+
+    def func():
+        track.setSegmentParameters(n//2, lamb_m=next(values))
+    return func
+
+
+# name, ladder, func of n returning benchmarked func
+BENCHMARKS = [
+    ('trackTransitonCurve', _LADDER, lambda n: lambda: trackTransitonCurve(
+        [0, 0, 0], [1, 0, 0], [10, 5, 3], [0, 1, 0], n=n
+    )),
+    ('frenetFromPfuncs', _SHORT_LADDER, _frenetCalls),
+    ('curveByCurve', _LADDER, lambda n: lambda: curveByCurve(
+        np.linspace(0, 1, n), _baseSplines(), _OVERLAY
+    )),
+    ('curveByCurve.pointwise', _SHORT_LADDER, lambda n: lambda: curveByCurve(
+        np.linspace(0, 1, n), _baseSplines(), _OVERLAY, batched=False
+    )),
+    ('HelixCircleParam', _LADDER, lambda n: _build(
+        HelixCircleParam, 3, 4, n=n
+    )),
+    ('InvHelixCircleParam', _LADDER, lambda n: _build(
+        InvHelixCircleParam, 3, 4, n=n
+    )),
+    ('Line', _LADDER, lambda n: _build(Line, [0, 0, 0], [3, 4, 5], n=n)),
+    ('SingleLoop', _LADDER, lambda n: _build(
+        SingleLoop, 20, 10, 8, 30, single_e_n=n
+    )),
+    ('DoubleLoop', _LADDER, lambda n: _build(
+        DoubleLoop, 20, 10, 8, 30, single_e_n=n
+    )),
+    ('Hill', _LADDER, lambda n: _build(
+        Hill, 30, 40, 25, 60, 50, 60, single_e_n=n
+    )),
+    ('TransitionHelix', _LADDER, lambda n: _build(
+        TransitionHelix, 0.3, 40, 40, single_n=20, final_n=n
+    )),
+    ('Track', _LADDER, _track),
+    ('Track.setSegmentParameters', (10, 100, 1000), _trackEdit),
+]
+
+
+# modules which cold import time is measured
+IMPORTS = ['rollerpy.funcs', 'rollerpy.models']
+
+_IMPORT_SCRIPT = '''
+import sys, time, tracemalloc
+if sys.argv[2] == 'memory':
+    tracemalloc.start()
+start = time.perf_counter()
+__import__(sys.argv[1])
+seconds = time.perf_counter() - start
+print(seconds, tracemalloc.get_traced_memory()[1], 'matplotlib' in sys.modules)
+'''
+
+
+def _runImport(module, mode):
+    output = subprocess.run(
+        [sys.executable, '-c', _IMPORT_SCRIPT, module, mode],
+        check=True, capture_output=True, text=True
+    ).stdout.split()
+    return float(output[0]), int(output[1]), output[2] == 'True'
+
+
+def importTime(module, repeat=3):
+    '''
+    Returns result of cold import of module: best time of repeat
+    imports in new interpreters, peak traced memory and whether
+    matplotlib was imported too.
+    '''
+    seconds = min(_runImport(module, 'time')[0] for _ in range(repeat))
+    _, peakBytes, plotting = _runImport(module, 'memory')
+    return {
+        'name': 'import ' + module,
+        'n': 1,
+        'seconds': seconds,
+        'peakBytes': peakBytes,
+        'plotting': plotting
+    }
+
+
+def _time(func, repeat):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peakMemory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def runSuite(names=None, repeat=3, maxN=None):
+    '''
+    Runs benchmarks (all or given by names) for every n of their
+    ladder (up to maxN) and cold imports. Returns json compatible
+    dict with best time of repeat runs and peak traced memory
+    of every case.
+    '''
+    results = [
+        importTime(module, repeat) for module in IMPORTS
+        if not names or 'import ' + module in names
+    ]
+    for name, ladder, setup in BENCHMARKS:
+        if names and name not in names:
+            continue
+        for n in ladder:
+            if maxN is not None and n > maxN:
+                continue
+            func = setup(n)
+            results.append({
+                'name': name,
+                'n': n,
+                'seconds': _time(func, repeat),
+                'peakBytes': _peakMemory(func)
+            })
+    return {
+        'meta': {
+            'version': __version__,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'time': time.time()
+        },
+        'results': results
+    }
+
+
+def compareResults(old, new, threshold=0.1, metric='seconds'):
+    '''
+    Returns list of (name, n, old, new) cases in which metric
+    of new results is more than threshold worse than of old ones.
+    '''
+    previous = {
+        (case['name'], case['n']): case[metric] for case in old['results']
+    }
+    regressions = []
+    for case in new['results']:
+        key = (case['name'], case['n'])
+        if key in previous and case[metric] > previous[key]*(1 + threshold):
+            regressions.append(key + (previous[key], case[metric]))
+    return regressions
+
+
+def scalingReport(results, limit=_SUPERLINEAR):
+    '''
+    Returns list of (name, exponent, superlinear) with exponent of
+    power law fitted to time of every benchmark over three largest
+    n of its ladder (smaller ones are dominated by constant costs).
+    '''
+    ladders = {}
+    for case in results['results']:
+        ladders.setdefault(case['name'], []).append(
+            (case['n'], case['seconds'])
+        )
+
+    report = []
+    for name, points in ladders.items():
+        if len(points) < 2:
+            continue
+        n, seconds = np.log(np.array(sorted(points)[-3:])).T
+        exponent = np.polyfit(n, seconds, 1)[0]
+        report.append((name, exponent, exponent > limit))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run')
+    run.add_argument('-o', '--output')
+    run.add_argument('--repeat', type=int, default=3)
+    run.add_argument('--max-n', type=int)
+    run.add_argument('names', nargs='*')
+
+    compare = commands.add_parser('compare')
+    compare.add_argument('old')
+    compare.add_argument('new')
+    compare.add_argument('--threshold', type=float, default=0.1)
+    compare.add_argument(
+        '--metric', choices=('seconds', 'peakBytes'), default='seconds'
+    )
+
+    scaling = commands.add_parser('scaling')
+    scaling.add_argument('results')
+    scaling.add_argument('--limit', type=float, default=_SUPERLINEAR)
+
+    check = commands.add_parser('check')
+    check.add_argument('names', nargs='*')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = runSuite(args.names, args.repeat, args.max_n)
+        text = json.dumps(results, indent=1)
+        if args.output:
+            with open(args.output, 'w') as output:
+                output.write(text)
+        else:
+            print(text)
+        return 0
+
+    if args.command == 'check':
+        from .checks import runChecks
+        results = runChecks(args.names)
+        for name, difference, tolerance, passed in results:
+            print('{:<32} {:.3g} (tolerance {:.3g}){}'.format(
+                name, difference, tolerance, '' if passed else '  FAILED'
+            ))
+        return 0 if all(passed for *_, passed in results) else 1
+
+    if args.command == 'compare':
+        with open(args.old) as old, open(args.new) as new:
+            regressions = compareResults(
+                json.load(old), json.load(new), args.threshold, args.metric
+            )
+        for name, n, before, after in regressions:
+            print('{} n={}: {:.4g} -> {:.4g}'.format(name, n, before, after))
+        return 1 if regressions else 0
+
+    with open(args.results) as results:
+        report = scalingReport(json.load(results), args.limit)
+    for name, exponent, superlinear in report:
+        print('{:<24} {:5.2f}{}'.format(
+            name, exponent, '  super-linear' if superlinear else ''
+        ))
+    return 1 if any(flag for _, _, flag in report) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,37 @@
 from .tools import (
-    trackTransitonCurve, printToSimulink,
+    trackTransitonCurve, trackTransitonCurves, printToSimulink,
     curveByCurve, frenetFromPfuncs,
-    trackVisualize
+    trackVisualize, tracksVisualize, joinSegments
     )
+from .frames import (
+    frenetFrames, framesFromDerivatives, rotationMinimizingFrames
+)
+from .arclength import ArcLengthIndex
+from .spatial import SpatialIndex
+from .export import exportSimulink, exportCSV, exportNpy, exportMat
+from .dynamics import rideDynamics
+from .transform import AffineTransform
+from .continuity import jointContinuity, segmentsContinuity
+from .sampling import adaptiveSamples, simplificationErrors, decimate
+from .piecewise import (
+    TransitionPiece, transitionPieces, PiecewiseCurve, splitSpline
+)
+from .instrument import (
+    stage, enableInstrumentation, disableInstrumentation,
+    resetInstrumentation, addHook, removeHook, timingTree, dumpTimingTree
+)
 
 __all__ = [
-    'trackTransitonCurve', 'printToSimulink',
+    'trackTransitonCurve', 'trackTransitonCurves', 'printToSimulink',
     'curveByCurve', 'frenetFromPfuncs',
-    'trackVisualize'
+    'trackVisualize', 'tracksVisualize', 'joinSegments', 'frenetFrames',
+    'framesFromDerivatives', 'rotationMinimizingFrames', 'ArcLengthIndex',
+    'SpatialIndex',
+    'exportSimulink', 'exportCSV', 'exportNpy', 'exportMat', 'rideDynamics',
+    'adaptiveSamples', 'simplificationErrors', 'decimate',
+    'jointContinuity', 'segmentsContinuity', 'AffineTransform',
+    'TransitionPiece', 'transitionPieces', 'PiecewiseCurve', 'splitSpline',
+    'stage', 'enableInstrumentation', 'disableInstrumentation',
+    'resetInstrumentation', 'addHook', 'removeHook', 'timingTree',
+    'dumpTimingTree'
 ]
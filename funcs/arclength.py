@@ -0,0 +1,94 @@
+import numpy as np
+
+
+class ArcLengthIndex(object):
+
+    '''
+    Cumulative arc length of sampled curve. Answers position, tangent
+    and t parameter queries at distance s (scalar or array) along the
+    curve with binary search and linear interpolation between samples.
+    '''
+
+    def __init__(self, points, t=None, derivatives=None):
+        # points and derivatives are [x, y, z] vectors or (3, n) arrays
+        self._points = np.asarray(points, dtype=float)
+        n = self._points.shape[1]
+
+        self.s = np.empty(n)
+        self.s[0] = 0
+        np.cumsum(
+            np.linalg.norm(np.diff(self._points, axis=1), axis=0),
+            out=self.s[1:]
+        )
+
+        self.t = np.arange(n, dtype=float) if t is None else np.asarray(t)
+        self._derivatives = None
+        if derivatives is not None:
+            self._derivatives = np.asarray(derivatives, dtype=float)
+
+    def returnLength(self):
+        return self.s[-1]
+
+    def _locate(self, s):
+        '''
+        Returns indexes of samples on the left of distances s
+        and interpolation weights between them and next samples.
+        '''
+        s = np.asarray(np.clip(s, 0, self.s[-1]), dtype=float)
+        i = np.searchsorted(self.s, s, side='right') - 1
+        i = np.asarray(np.clip(i, 0, max(self.s.size - 2, 0)))
+
+        step = self.s[np.minimum(i + 1, self.s.size - 1)] - self.s[i]
+        w = np.divide(
+            s - self.s[i], step, out=np.zeros_like(s), where=step > 0
+        )
+        return (i, w)
+
+    @staticmethod
+    def _interpolate(values, i, w):
+        j = np.minimum(i + 1, values.shape[-1] - 1)
+        return values[..., i]*(1 - w) + values[..., j]*w
+
+    def gimmePoint(self, s):
+        '''
+        Returns [x, y, z] point (or (3, k) array) at distance s.
+        '''
+        i, w = self._locate(s)
+        return self._interpolate(self._points, i, w)
+
+    def gimmeParam(self, s):
+        '''
+        Returns t parameter at distance s.
+        '''
+        i, w = self._locate(s)
+        return self._interpolate(self.t, i, w)
+
+    def gimmeTangent(self, s):
+        '''
+        Returns unit tangent vector at distance s. Interpolated from
+        derivatives when given, direction of chord otherwise.
+        '''
+        i, w = self._locate(s)
+        if self._derivatives is not None:
+            tangent = self._interpolate(self._derivatives, i, w)
+        else:
+            j = np.minimum(i + 1, self.s.size - 1)
+            tangent = self._points[:, j] - self._points[:, i]
+        return tangent/np.linalg.norm(tangent, axis=0)
+
+    def gimmeAtDistance(self, s):
+        '''
+        Returns tuple with point, unit tangent and t parameter
+        at distance s.
+        '''
+        return (self.gimmePoint(s), self.gimmeTangent(s), self.gimmeParam(s))
+
+    def resample(self, ds=None, n=None):
+        '''
+        Returns tuple with distances and (3, k) array of points evenly
+        spaced along the curve, at most ds apart or in n points.
+        '''
+        if n is None:
+            n = int(np.ceil(self.s[-1]/ds)) + 1
+        s = np.linspace(0, self.s[-1], n)
+        return (s, self.gimmePoint(s))
@@ -0,0 +1,206 @@
+import numpy as np
+
+from .instrument import stage
+from .tools import joinSegments, _segmentRows
+
+_REPORT_FIELDS = (
+    ('index', np.intp), ('gap', float),
+    ('step', float), ('turn', float), ('jump', float),
+    ('stepRatio', float), ('turnRatio', float), ('jumpRatio', float),
+    ('duplicate', bool), ('c0', bool), ('c1', bool), ('c2', bool)
+)
+
+# samples around joint which show it, and samples used as baseline
+_NEAR = np.array([-1, 0, 1])
+_BASE = np.array([-3, -2, 2, 3])
+
+
+def _norm(vectors):
+    return np.sqrt(np.einsum('ij,ij->j', vectors, vectors))
+
+
+def _unit(vectors):
+    norm = _norm(vectors)
+    return np.divide(
+        vectors, norm, out=np.zeros_like(vectors), where=norm > 0
+    )
+
+
+def _angles(a, b):
+    '''
+    Returns angles between columns of (3, k) arrays a and b.
+    '''
+    return np.arctan2(_norm(np.cross(a, b, axis=0)), np.sum(a*b, axis=0))
+
+
+def _windows(values, joints, shifts):
+    '''
+    Returns (len(joints), len(shifts)) array of values around joints,
+    nan outside of values.
+    '''
+    idx = joints[:, None] + shifts
+    inside = (idx >= 0) & (idx < values.size)
+    return np.where(inside, values[np.clip(idx, 0, values.size - 1)], np.nan)
+
+
+def _ratios(values, joints):
+    '''
+    Returns largest value near every joint and its ratio
+    to largest value a bit farther from joint.
+    '''
+    near = np.fmax.reduce(_windows(values, joints, _NEAR), axis=1)
+    base = np.fmax.reduce(_windows(values, joints, _BASE), axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (near, near/base)
+
+
+def _chordCurvature(points):
+    '''
+    Returns (3, n) array of curvature vectors of circles through
+    every sample and its neighbours (nan at ends).
+    '''
+    n = points.shape[1]
+    chords = np.diff(points, axis=1)
+    units = _unit(chords)
+    lengths = _norm(chords[:, :-1]) + _norm(chords[:, 1:])
+    curvature = np.full((3, n), np.nan)
+    curvature[:, 1:-1] = np.divide(
+        2*np.diff(units, axis=1), lengths,
+        out=np.zeros((3, n - 2)), where=lengths > 0
+    )
+    return curvature
+
+
+def _sampleMetrics(points, d1, d2):
+    '''
+    Returns step, turn and jump arrays, value i is change between
+    samples i - 1 and i of position, tangent direction and curvature
+    vector. Without derivatives tangents are taken from chords (turn
+    is turning angle of chords in sample i) and curvature vectors from
+    circles through three samples.
+    '''
+    n = points.shape[1]
+    step, turn, jump = np.full((3, n), np.nan)
+    step[1:] = _norm(np.diff(points, axis=1))
+    if n < 3:
+        return (step, turn, jump)
+
+    if d1 is None:
+        units = _unit(np.diff(points, axis=1))
+        turn[1:-1] = _angles(units[:, :-1], units[:, 1:])
+    else:
+        tangent = _unit(d1)
+        turn[1:] = _angles(tangent[:, :-1], tangent[:, 1:])
+
+    if d1 is None or d2 is None:
+        curvature = _chordCurvature(points)
+    else:
+        # curvature vector does not depend on parametrization,
+        # so segments with different t scales can be compared
+        speed2 = np.sum(d1*d1, axis=0)
+        normal = d2 - np.sum(d2*tangent, axis=0)*tangent
+        curvature = np.divide(
+            normal, speed2, out=np.zeros_like(normal), where=speed2 > 0
+        )
+    jump[1:] = _norm(np.diff(curvature, axis=1))
+    return (step, turn, jump)
+
+
+def jointContinuity(
+    points, offsets, d1=None, d2=None, factor=1.5, rtol=1e-6
+):
+    '''
+    Checks joints of segments of sampled curve in one vectorized pass.
+    Takes (3, n) arrays (or [x, y, z] vectors) of points and optionally
+    their first and second derivatives, segment k is in
+    points[:, offsets[k]:offsets[k + 1]]. Returns structured array
+    with row for every joint with fields:
+
+        index       first sample of next segment
+        gap         distance between end of segment and start of
+                    next one (nan when not known, see
+                    segmentsContinuity)
+        step        largest distance of samples around joint
+        turn        largest angle between tangents around joint
+        jump        largest change of curvature vector around joint
+        stepRatio   step, turn and jump divided by the same changes
+        turnRatio   two and three samples away from joint
+        jumpRatio
+        duplicate   samples around joint are (almost) the same
+        c0          position is continuous (no gap or missing samples)
+        c1          tangent is continuous
+        c2          curvature is continuous
+
+    Change is continuous when its ratio is at most factor or it is
+    at most rtol of the largest change (distances and curvatures
+    are compared with size and curvature of whole curve).
+    '''
+    points = np.asarray(points, dtype=float)
+    d1 = None if d1 is None else np.asarray(d1, dtype=float)
+    d2 = None if d2 is None else np.asarray(d2, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    n = points.shape[1]
+    joints = offsets[1:-1]
+    joints = joints[(joints > 0) & (joints < n)]
+
+    report = np.zeros(joints.size, dtype=list(_REPORT_FIELDS))
+    report['index'] = joints
+    report['gap'] = np.nan
+    if not n:
+        return report
+
+    with stage('jointContinuity', points=n):
+        step, turn, jump = _sampleMetrics(points, d1, d2)
+        tolerances = (
+            rtol*np.ptp(points, axis=1).max(), rtol*np.pi,
+            rtol*np.nanmax(jump, initial=0)
+        )
+        for name, flag, values, tolerance in zip(
+            ('step', 'turn', 'jump'), ('c0', 'c1', 'c2'),
+            (step, turn, jump), tolerances
+        ):
+            near, ratio = _ratios(values, joints)
+            report[name] = near
+            report[name + 'Ratio'] = ratio
+            # without baseline (very short segments) ratio is nan
+            # and joint is not reported
+            report[flag] = ~(ratio > factor) | (near <= tolerance)
+
+        smallest = np.fmin.reduce(_windows(step, joints, _NEAR), axis=1)
+        report['duplicate'] = smallest <= tolerances[0]
+
+    return report
+
+
+def segmentsContinuity(segments, factor=1.5, rtol=1e-6):
+    '''
+    Checks joints of list of segments (Curve objects or [x, y, z]
+    vectors), end of every segment should be start of the next
+    one. Returns the same report as jointContinuity, with gap
+    between end and start of segments, segments are joined with
+    shared joints. Derivatives of curves are used when all
+    segments have them.
+    '''
+    rows = [
+        np.asarray(_segmentRows(segment), dtype=float)
+        for segment in segments
+    ]
+    points, offsets = joinSegments(rows)
+    d1 = d2 = None
+    if segments and all(
+        hasattr(segment, 'returnSecondDerivatives') for segment in segments
+    ):
+        d1, _ = joinSegments([
+            (segment.dx, segment.dy, segment.dz) for segment in segments
+        ])
+        d2, _ = joinSegments([
+            segment.returnSecondDerivatives() for segment in segments
+        ])
+
+    report = jointContinuity(points, offsets, d1, d2, factor, rtol)
+    ends = np.array([row[:, -1] for row in rows[:-1]]).reshape(-1, 3)
+    starts = np.array([row[:, 0] for row in rows[1:]]).reshape(-1, 3)
+    report['gap'] = np.linalg.norm(starts - ends, axis=1)
+    scale = rtol*np.ptp(points, axis=1).max() if points.size else 0
+    report['c0'] &= report['gap'] <= scale
+    return report
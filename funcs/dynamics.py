@@ -0,0 +1,128 @@
+import numpy as np
+
+from .frames import _fillDegenerate
+from .instrument import stage
+
+_G = 9.81
+
+_DYNAMICS_FIELDS = (
+    's', 'curvature', 'torsion', 'speed',
+    'normalG', 'lateralG', 'verticalG'
+)
+
+
+def _dot(a, b):
+    return np.einsum('ij,ij->j', a, b)
+
+
+def _cumulativeTrapezoid(values, ds):
+    result = np.empty(values.size)
+    result[0] = 0
+    np.cumsum((values[1:] + values[:-1])*ds/2, out=result[1:])
+    return result
+
+
+def _perpendicular(vectors, tangent):
+    '''
+    Returns part of (3, n) (or (3, 1)) vectors perpendicular to tangent.
+    '''
+    return vectors - np.sum(vectors*tangent, axis=0)*tangent
+
+
+def _carFrame(tangent, up):
+    '''
+    Returns (3, n) arrays of car's up and left unit vectors, up
+    is made perpendicular to tangent. Where it is parallel to
+    tangent, up of the nearest regular point is used.
+    '''
+    vertical = _perpendicular(up, tangent)
+    valid = np.linalg.norm(vertical, axis=0) > 1e-9
+    vertical = _fillDegenerate(vertical.T, valid, tangent.T).T
+    vertical /= np.linalg.norm(vertical, axis=0)
+    return (vertical, np.cross(vertical, tangent, axis=0))
+
+
+def rideDynamics(
+    points, d1, d2, t=None, v0=0.0, friction=0.0, g=_G,
+    up=(0, 0, 1), carUp=None, iterations=2, dtype=float
+):
+    '''
+    Takes (3, n) arrays (or [x, y, z] vectors) of points, their first
+    and second derivatives in t. Returns structured array aligned
+    with points with fields:
+
+        s           arc length (sum of chords)
+        curvature   curvature
+        torsion     torsion (third derivative is gradient of d2 in t)
+        speed       speed from energy conservation, starting with v0
+        normalG     centripetal acceleration in g
+        lateralG    felt acceleration to the left of car in g
+        verticalG   felt acceleration to the top of car in g
+
+    Speed and g-forces are nan from the point the train does not
+    get to. Friction loss is friction coefficient times normal load
+    (gravity and centripetal force). Normal load depends on speed,
+    so speed is calculated again iterations times with load of
+    previous speed.
+
+    up is world up direction (against gravity). Car's up is taken
+    from (3, n) carUp array (e.g. rotation minimizing frame), by
+    default it is world up (track without banking and inversions).
+    '''
+    points = np.asarray(points, dtype=float)
+    d1 = np.asarray(d1, dtype=float)
+    d2 = np.asarray(d2, dtype=float)
+    n = points.shape[1]
+    t = np.arange(n, dtype=float) if t is None else np.asarray(t)
+    up = np.asarray(up, dtype=float).reshape(3, 1)
+    up = up/np.linalg.norm(up)
+    carUp = up if carUp is None else np.asarray(carUp, dtype=float)
+
+    result = np.empty(n, dtype=[(name, dtype) for name in _DYNAMICS_FIELDS])
+
+    with stage('rideDynamics', points=n):
+        ds = np.linalg.norm(np.diff(points, axis=1), axis=0)
+        result['s'][0] = 0
+        np.cumsum(ds, out=result['s'][1:])
+
+        speed1 = np.linalg.norm(d1, axis=0)
+        tangent = d1/speed1
+        cross = np.cross(d1, d2, axis=0)
+        cross2 = _dot(cross, cross)
+        result['curvature'] = np.sqrt(cross2)/speed1**3
+
+        d3 = np.gradient(d2, t, axis=1) if n > 1 else np.zeros_like(d2)
+        regular = cross2 > 1e-18*speed1**6
+        result['torsion'] = np.divide(
+            _dot(cross, d3), cross2,
+            out=np.zeros(n), where=regular
+        )
+
+        # curvature vector (curvature times principal normal)
+        kvec = (d2 - _dot(d2, tangent)*tangent)/speed1**2
+        # gravity part of track reaction perpendicular to tangent
+        gperp = g*_perpendicular(up, tangent)
+
+        # kinetic energy per unit mass
+        height = (up.T @ points)[0]
+        initial = v0**2/2 - g*(height - height[0])
+        energy = initial
+        for _ in range(iterations if friction else 0):
+            load = np.linalg.norm(
+                np.maximum(2*energy, 0)*kvec + gperp, axis=0
+            )
+            energy = initial - friction*_cumulativeTrapezoid(load, ds)
+
+        v2 = np.maximum(2*energy, 0)
+        reaction = v2*kvec + gperp
+        vertical, left = _carFrame(tangent, carUp)
+        result['speed'] = np.sqrt(v2)
+        result['normalG'] = v2*np.sqrt(_dot(kvec, kvec))/g
+        result['lateralG'] = _dot(reaction, left)/g
+        result['verticalG'] = _dot(reaction, vertical)/g
+
+        notReached = ~np.logical_and.accumulate(energy >= 0)
+        for name in ('speed', 'normalG', 'lateralG', 'verticalG'):
+            result[name][notReached] = np.nan
+
+    return result
@@ -0,0 +1,104 @@
+from collections.abc import Iterator
+
+import numpy as np
+
+_CHUNK = 2**16
+
+
+def _pointsRows(points):
+    '''
+    Returns x, y, z arrays of Curve object or [x, y, z] vector.
+    '''
+    if isinstance(points, Iterator):
+        raise TypeError('whole points are needed, not chunks iterator')
+    if hasattr(points, 'returnXarray'):
+        return (
+            points.returnXarray(),
+            points.returnYarray(),
+            points.returnZarray()
+        )
+    return tuple(np.asarray(row) for row in points)
+
+
+def _chunks(points, chunk, dtype=float):
+    '''
+    Yields (k, 3) arrays with consecutive points. The same buffer
+    is reused for every chunk. points can be also iterator of
+    consecutive (3, k) chunks (e.g. layoutChunks points).
+    '''
+    if isinstance(points, Iterator):
+        for part in points:
+            yield from _chunks(part, chunk, dtype)
+        return
+    rows = _pointsRows(points)
+    size = len(rows[0])
+    block = np.empty((min(chunk, size), 3), dtype=dtype)
+    for start in range(0, size, chunk):
+        stop = min(start + chunk, size)
+        for axis in range(3):
+            block[:stop - start, axis] = rows[axis][start:stop]
+        yield block[:stop - start]
+
+
+def _writeText(fileobj, points, chunk, precision, delimiter, newline):
+    '''
+    Writes points chunk by chunk, every chunk is formatted
+    with one string formatting operation.
+    '''
+    fmt = '%s' if precision is None else '%.{}g'.format(precision)
+    rowfmt = delimiter.join([fmt]*3) + newline
+    for block in _chunks(points, chunk):
+        fileobj.write((rowfmt*len(block)) % tuple(block.ravel().tolist()))
+
+
+def exportSimulink(points, fileobj, chunk=_CHUNK, precision=None):
+    '''
+    Writes points (Curve, [x, y, z] vector or iterator of (3, k)
+    chunks) to text file-like object as matrix to copy to simulink
+    simscape model.
+    '''
+    fileobj.write('[\n')
+    _writeText(fileobj, points, chunk, precision, ', ', ';\n')
+    fileobj.write(']\n')
+
+
+def exportCSV(
+    points, fileobj, chunk=_CHUNK, precision=None, header='x,y,z'
+):
+    '''
+    Writes points (Curve, [x, y, z] vector or iterator of (3, k)
+    chunks) to text file-like object as comma separated values.
+    '''
+    if header:
+        fileobj.write(header + '\n')
+    _writeText(fileobj, points, chunk, precision, ',', '\n')
+
+
+def exportNpy(points, fileobj, chunk=_CHUNK, dtype=float):
+    '''
+    Writes points (Curve or [x, y, z] vector) to binary file-like
+    object as (n, 3) numpy .npy array. Data is written chunk by chunk
+    straight from numpy buffers.
+    '''
+    rows = _pointsRows(points)
+    dtype = np.dtype(dtype)
+    np.lib.format.write_array_header_1_0(fileobj, {
+        'descr': np.lib.format.dtype_to_descr(dtype),
+        'fortran_order': False,
+        'shape': (len(rows[0]), 3)
+    })
+    for block in _chunks(rows, chunk, dtype=dtype):
+        fileobj.write(memoryview(block).cast('B'))
+
+
+def exportMat(points, fileobj, name='track'):
+    '''
+    Writes points (Curve or [x, y, z] vector) to binary file-like
+    object as (n, 3) matrix in matlab .mat file.
+    '''
+    from scipy.io import savemat
+
+    # (3, n) C ordered array is (n, 3) fortran ordered matrix,
+    # which is matlab's memory layout
+    matrix = np.asarray(_pointsRows(points), dtype=float).T
+    savemat(fileobj, {name: matrix})
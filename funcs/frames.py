@@ -0,0 +1,194 @@
+import numpy as np
+
+_DX = 10e-6
+
+
+def _centralDifference(func, t, dx, n):
+    '''
+    Central difference of func in every point of t (scalar or array).
+    Same three point stencil as scipy's derivative with order=3.
+    '''
+    if n == 1:
+        return (func(t + dx) - func(t - dx))/(2*dx)
+    return (func(t + dx) - 2*func(t) + func(t - dx))/dx**2
+
+
+def _evalDerivative(func, dfunc, t, n, dx):
+    '''
+    Returns n-th derivative of func in t. Uses dfunc if given,
+    spline derivative if func is scipy's PPoly (e.g. CubicSpline)
+    and central difference otherwise.
+    '''
+    if dfunc is not None:
+        return dfunc(t)
+    if hasattr(func, 'derivative') and hasattr(func, 'c'):
+        return func(t, n)
+    return _centralDifference(func, t, dx, n)
+
+
+def _perpendicularUp(tangents):
+    '''
+    Returns part of z axis (x axis for vertical tangents)
+    perpendicular to (k, 3) unit tangents.
+    '''
+    up = np.zeros_like(tangents)
+    up[:, 2] = 1
+    vertical = np.abs(tangents[:, 2]) > 1 - 1e-6
+    up[vertical] = [1, 0, 0]
+    return up - np.sum(up*tangents, axis=1)[:, None]*tangents
+
+
+def _fillDegenerate(vectors, valid, tangents):
+    '''
+    Replaces vectors in not valid rows with nearest valid
+    previous (or next, for leading rows) vector. When there is no
+    valid row at all, vector perpendicular to tangent is used.
+    '''
+    if valid.all():
+        return vectors
+    if not valid.any():
+        return _perpendicularUp(tangents)
+
+    idx = np.where(valid, np.arange(valid.size), -1)
+    np.maximum.accumulate(idx, out=idx)
+    idx[idx < 0] = np.argmax(valid)
+    filled = vectors[idx]
+    # keep filled vector perpendicular to its own tangent
+    filled -= np.sum(filled*tangents, axis=1)[:, None]*tangents
+    return filled
+
+
+def framesFromDerivatives(d1, d2, eps=1e-9):
+    '''
+    Takes (k, 3) arrays of first and second derivatives.
+    Returns tuple with (k, 3) arrays of frenet's p, n, b unit vectors.
+
+    Where curvature is (almost) zero (straight lines, inflection
+    points), normal vector from the nearest regular point is used.
+    '''
+    d1 = np.atleast_2d(np.asarray(d1, dtype=float))
+    d2 = np.atleast_2d(np.asarray(d2, dtype=float))
+
+    speed = np.linalg.norm(d1, axis=1)
+    p = d1/speed[:, None]
+
+    curvature = np.linalg.norm(np.cross(d1, d2), axis=1)
+    valid = curvature > eps*speed**3
+
+    n = _fillDegenerate(d2.copy(), valid, p)
+    n /= np.linalg.norm(n, axis=1)[:, None]
+
+    b = np.cross(p, n)
+    b /= np.linalg.norm(b, axis=1)[:, None]
+
+    return (p, n, b)
+
+
+def frenetFrames(t, funcs, dfuncs=None, ddfuncs=None, dx=_DX, eps=1e-9):
+    '''
+    Takes array of t parameters and x, y, z funcs. Returns tuple
+    with (len(t), 3) arrays of frenet's p, n, b unit vectors.
+
+    First and second derivatives are taken from dfuncs and ddfuncs
+    when given, from spline derivatives when funcs are CubicSplines
+    and from vectorized central differences otherwise.
+    '''
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+    dfuncs = dfuncs or (None, None, None)
+    ddfuncs = ddfuncs or (None, None, None)
+
+    d1 = np.empty((t.size, 3))
+    d2 = np.empty((t.size, 3))
+    for axis in range(3):
+        d1[:, axis] = _evalDerivative(
+            funcs[axis], dfuncs[axis], t, 1, dx
+        )
+        d2[:, axis] = _evalDerivative(
+            funcs[axis], ddfuncs[axis], t, 2, dx
+        )
+
+    return framesFromDerivatives(d1, d2, eps=eps)
+
+
+def frameMatrices(p, n, b):
+    '''
+    Stacks p, n, b unit vectors into (k, 3, 3) array of direction
+    cosine matrices between local and global coordinate system.
+    '''
+    return np.stack((p, n, b), axis=1)
+
+
+def _reflections(vectors):
+    '''
+    Returns (k, 3, 3) array of reflections in planes perpendicular
+    to (k, 3) vectors (identity for zero vectors).
+    '''
+    c = np.sum(vectors*vectors, axis=1)
+    scale = np.divide(2, c, out=np.zeros_like(c), where=c > 0)
+    return (
+        np.eye(3) - scale[:, None, None]*vectors[:, :, None]*vectors[:, None]
+    )
+
+
+def _prefixProducts(matrices):
+    '''
+    Returns (k, 3, 3) array of products M[i] @ ... @ M[0] of (k, 3, 3)
+    matrices. Matrices are split into about sqrt(k) blocks, products
+    inside all blocks are taken at once, then blocks are chained.
+    '''
+    k = len(matrices)
+    if not k:
+        return matrices.copy()
+    size = max(int(np.sqrt(k)), 1)
+    count = -(-k//size)
+    blocks = np.broadcast_to(np.eye(3), (count*size, 3, 3)).copy()
+    blocks[:k] = matrices
+    blocks = blocks.reshape(count, size, 3, 3)
+
+    for i in range(1, size):
+        np.matmul(blocks[:, i], blocks[:, i - 1], out=blocks[:, i])
+    chained = np.empty((count, 3, 3))
+    chained[0] = np.eye(3)
+    for i in range(1, count):
+        chained[i] = blocks[i - 1, -1] @ chained[i - 1]
+
+    return (blocks @ chained[:, None]).reshape(-1, 3, 3)[:k]
+
+
+def rotationMinimizingFrames(points, tangents, normal=None):
+    '''
+    Takes (k, 3) arrays of curve points and tangents. Returns tuple
+    with (k, 3) arrays of p (unit tangent), n, b unit vectors of
+    rotation minimizing (parallel transport) frames. Unlike frenet's
+    frames they do not flip or get undefined where curvature is zero.
+
+    First n is normal (made perpendicular to first tangent), vertical
+    direction by default. Frames are transported along samples by
+    double reflection (Wang et al. 2008): step between two samples
+    is rotation, so frames are prefix products of rotations
+    (taken in O(k), without python loop over samples).
+    '''
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    p = np.atleast_2d(np.asarray(tangents, dtype=float))
+    p = p/np.linalg.norm(p, axis=1)[:, None]
+
+    if normal is None:
+        first = _perpendicularUp(p[:1])[0]
+    else:
+        first = np.asarray(normal, dtype=float)
+        first = first - np.dot(first, p[0])*p[0]
+
+    # first reflection in bisector plane of chord, second one
+    # rotates reflected tangent into the next tangent
+    chords = _reflections(np.diff(points, axis=0))
+    reflected = np.einsum('kij,kj->ki', chords, p[:-1])
+    steps = _reflections(p[1:] - reflected) @ chords
+
+    n = np.empty_like(p)
+    n[0] = first
+    n[1:] = _prefixProducts(steps) @ first
+    # remove rounding drift of long products
+    n -= np.sum(n*p, axis=1)[:, None]*p
+    n /= np.linalg.norm(n, axis=1)[:, None]
+
+    return (p, n, np.cross(p, n))
@@ -0,0 +1,181 @@
+from collections import OrderedDict
+from contextlib import nullcontext
+import sys
+import time
+import tracemalloc
+
+_NULL = nullcontext()
+
+_state = {
+    'enabled': False,
+    'memory': False,
+    'byInstance': False
+}
+_hooks = []
+_stack = []
+
+
+class _Node(object):
+
+    '''
+    Totals of one stage in timing tree.
+    '''
+
+    __slots__ = ('name', 'calls', 'seconds', 'points', 'bytes', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.points = 0
+        self.bytes = 0
+        self.children = OrderedDict()
+
+    def child(self, name):
+        try:
+            return self.children[name]
+        except KeyError:
+            node = self.children[name] = _Node(name)
+            return node
+
+    def asDict(self):
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'points': self.points,
+            'bytes': self.bytes,
+            'children': [child.asDict() for child in self.children.values()]
+        }
+
+
+_root = _Node('root')
+
+
+class _Stage(object):
+
+    '''
+    Context manager recording one call of stage.
+    Points can be set on it before stage ends.
+    '''
+
+    __slots__ = ('name', 'curve', 'points', '_node', '_start', '_bytes')
+
+    def __init__(self, name, curve, points):
+        self.name = name
+        self.curve = curve
+        self.points = points
+
+    def __enter__(self):
+        name = self.name
+        if self.curve is not None and _state['byInstance']:
+            name = '{}#{:x}'.format(name, id(self.curve))
+        self._node = (_stack[-1] if _stack else _root).child(name)
+        _stack.append(self._node)
+        self._bytes = 0
+        if _state['memory']:
+            self._bytes = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self._start
+        allocated = 0
+        if _state['memory']:
+            allocated = tracemalloc.get_traced_memory()[0] - self._bytes
+        _stack.pop()
+
+        node = self._node
+        node.calls += 1
+        node.seconds += seconds
+        node.points += self.points or 0
+        node.bytes += allocated
+
+        for hook in _hooks:
+            hook({
+                'stage': self.name,
+                'curve': self.curve,
+                'seconds': seconds,
+                'points': self.points,
+                'bytes': allocated,
+                'depth': len(_stack)
+            })
+        return False
+
+
+def stage(name, curve=None, points=None):
+    '''
+    Returns context manager recording time, points and allocated
+    bytes of named stage (of curve instance) into timing tree.
+    When instrumentation is disabled shared no-op context is returned.
+    '''
+    if not _state['enabled']:
+        return _NULL
+    return _Stage(name, curve, points)
+
+
+def enableInstrumentation(memory=False, byInstance=False):
+    '''
+    Turns on recording of stages. With memory, allocated bytes are
+    traced with tracemalloc (which slows everything down). With
+    byInstance, every curve instance has its own tree nodes.
+    '''
+    _state['enabled'] = True
+    _state['memory'] = memory
+    _state['byInstance'] = byInstance
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disableInstrumentation():
+    if _state['memory'] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _state['enabled'] = False
+    _state['memory'] = False
+
+
+def resetInstrumentation():
+    '''
+    Drops recorded timing tree.
+    '''
+    _root.children.clear()
+    del _stack[:]
+
+
+def addHook(hook):
+    '''
+    Adds func called with dict describing every finished stage,
+    e.g. to forward it to metrics system.
+    '''
+    _hooks.append(hook)
+
+
+def removeHook(hook):
+    _hooks.remove(hook)
+
+
+def timingTree():
+    '''
+    Returns recorded stages as nested dicts.
+    '''
+    return _root.asDict()
+
+
+def dumpTimingTree(fileobj=None):
+    '''
+    Writes recorded stages as indented text.
+    '''
+    fileobj = fileobj or sys.stdout
+
+    def dump(node, depth):
+        fileobj.write(
+            '{:<48} {:>8} {:>12.6f} s {:>12} points {:>12} B\n'.format(
+                '  '*depth + node.name, node.calls, node.seconds,
+                node.points, node.bytes
+            )
+        )
+        for child in node.children.values():
+            dump(child, depth + 1)
+
+    for child in _root.children.values():
+        dump(child, 0)
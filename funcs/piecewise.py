@@ -0,0 +1,143 @@
+import numpy as np
+
+# rows are cubic hermite basis polynomials for point1, slope1,
+# point2 and slope2, columns are coefficients of u^0 ... u^3
+_HERMITE = np.array([
+    [1, 0, -3, 2],
+    [0, 1, -2, 1],
+    [0, 0, 3, -2],
+    [0, 0, -1, 1]
+], dtype=float)
+
+
+def _powers(u, order):
+    '''
+    Returns (k, 4) array of order-th derivatives of u^0 ... u^3.
+    '''
+    powers = np.zeros((u.size, 4))
+    for power in range(order, 4):
+        factor = np.prod(np.arange(power - order + 1, power + 1))
+        powers[:, power] = factor*u**(power - order)
+    return powers
+
+
+class TransitionPiece(object):
+
+    '''
+    Closed form of u^3 parabola created by trackTransitonCurve,
+    u is in [0, 1]. n is number of its samples (when known).
+    '''
+
+    def __init__(self, point1, slope1, point2, slope2, n=None):
+        self._controls = np.array(
+            [point1, slope1, point2, slope2], dtype=float
+        ).reshape(4, 3)
+        self.n = n
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, TransitionPiece) and self.n == other.n
+            and np.array_equal(self._controls, other._controls)
+        )
+
+    __hash__ = None
+
+    def evaluate(self, u, order=0):
+        '''
+        Returns (3, len(u)) array of points (order 0) or their
+        first or second derivatives in u.
+        '''
+        u = np.atleast_1d(np.asarray(u, dtype=float))
+        basis = _powers(u, order) @ _HERMITE.T
+        return (basis @ self._controls).T
+
+    def returnParamRange(self):
+        return (0, 1)
+
+
+def transitionPieces(points1, slopes1, points2, slopes2, n=None):
+    '''
+    Returns list of TransitionPieces for the same (k, 3) arrays
+    as trackTransitonCurves.
+    '''
+    return [
+        TransitionPiece(*controls, n=n) for controls in zip(*(
+            np.asarray(vectors, dtype=float).reshape(-1, 3)
+            for vectors in (points1, slopes1, points2, slopes2)
+        ))
+    ]
+
+
+class PiecewiseCurve(object):
+
+    '''
+    Curve composed from pieces. Piece k is evaluate(u, order) func
+    returning (3, len(u)) array, its [u0, u1] range is mapped linearly
+    on [starts[k], stops[k]] of global parameter. Derivatives are taken
+    from pieces (scaled by the mapping), so they are exact. At shared
+    joints the next piece is used.
+    '''
+
+    def __init__(self, evaluates, ranges, starts, stops):
+        self._evaluates = list(evaluates)
+        ranges = np.asarray(ranges, dtype=float).reshape(-1, 2)
+        self._starts = np.asarray(starts, dtype=float)
+        stops = np.asarray(stops, dtype=float)
+
+        self._u0 = ranges[:, 0]
+        span = stops - self._starts
+        self._scales = np.divide(
+            ranges[:, 1] - ranges[:, 0], span,
+            out=np.zeros_like(span), where=span > 0
+        )
+
+    def __call__(self, t, order=0):
+        '''
+        Returns (3, len(t)) array of points (order 0) or their first
+        or second derivatives in t (scalar t gives [x, y, z]).
+        '''
+        t = np.asarray(t, dtype=float)
+        scalar = t.ndim == 0
+        t = np.atleast_1d(t)
+
+        pieces = np.searchsorted(self._starts, t, side='right') - 1
+        np.clip(pieces, 0, len(self._evaluates) - 1, out=pieces)
+
+        result = np.empty((3, t.size))
+        # loop over pieces, every piece is evaluated at once
+        for k in np.unique(pieces):
+            mask = pieces == k
+            scale = self._scales[k]
+            u = self._u0[k] + (t[mask] - self._starts[k])*scale
+            result[:, mask] = self._evaluates[k](u, order)*scale**order
+
+        return result[:, 0] if scalar else result
+
+    def axisFuncs(self):
+        '''
+        Returns tuple of x, y, z funcs and their first
+        and second derivatives funcs. Every func evaluates all
+        axes, call the curve itself to get them at once.
+        '''
+        return tuple(
+            tuple(
+                (lambda t, axis=axis, order=order: self(t, order)[axis])
+                for axis in range(3)
+            )
+            for order in range(3)
+        )
+
+
+def splitSpline(spline):
+    '''
+    Splits multi-axis spline (fitted with axis=1 to (3, n) array)
+    into tuple of x, y, z splines, without fitting them again.
+    '''
+    from scipy.interpolate import PPoly
+
+    return tuple(
+        PPoly.construct_fast(
+            np.ascontiguousarray(spline.c[..., axis]), spline.x
+        )
+        for axis in range(spline.c.shape[-1])
+    )
@@ -0,0 +1,148 @@
+import numpy as np
+
+from .instrument import stage
+from .spatial import pointsSegmentsDistance
+
+# interior points of interval checked against its chord
+_PROBES = np.array([0.25, 0.5, 0.75])
+
+
+def adaptiveSamples(func, breaks, tolerance, maxLevels=30):
+    '''
+    Samples curve func(t) -> (3, len(t)) array so that polyline
+    through samples deviates from curve at most about tolerance.
+
+    Starts with intervals between sorted breaks (e.g. segment joints)
+    and bisects all intervals which chord is farther than tolerance
+    from curve points at 1/4, 1/2 or 3/4 of interval, level by level,
+    at most maxLevels times. Straight parts keep few samples,
+    tight turns get many. Returns tuple with t array and (3, k)
+    array of points.
+    '''
+    breaks = np.unique(np.asarray(breaks, dtype=float))
+    with stage('adaptiveSamples') as record:
+        a, b = breaks[:-1], breaks[1:]
+        ends = func(breaks)
+        pa, pb = ends[:, :-1], ends[:, 1:]
+
+        found = [breaks]
+        for _ in range(maxLevels):
+            if not a.size:
+                break
+            probes = a + (b - a)*_PROBES[:, None]
+            values = func(probes.ravel()).reshape(3, _PROBES.size, a.size)
+
+            error = np.zeros(a.size)
+            for i in range(_PROBES.size):
+                np.maximum(error, pointsSegmentsDistance(
+                    values[:, i].T, pa.T, pb.T
+                ), out=error)
+
+            split = error > tolerance
+            middle, pmiddle = probes[1, split], values[:, 1, split]
+            found.append(middle)
+            a, b = (
+                np.concatenate((a[split], middle)),
+                np.concatenate((middle, b[split]))
+            )
+            pa, pb = (
+                np.concatenate((pa[:, split], pmiddle), axis=1),
+                np.concatenate((pmiddle, pb[:, split]), axis=1)
+            )
+
+        t = np.sort(np.concatenate(found))
+        points = func(t)
+        if record is not None:
+            record.points = t.size
+    return (t, points)
+
+
+def _firstMaxima(values, groups, count):
+    '''
+    Returns maximum of values and index of its first occurrence
+    in every of count groups (values are sorted by group).
+    '''
+    starts = np.searchsorted(groups, np.arange(count))
+    maxima = np.maximum.reduceat(values, starts)
+    hits = np.flatnonzero(values == maxima[groups])
+    first = hits[np.searchsorted(groups[hits], np.arange(count))]
+    return (maxima, first)
+
+
+def simplificationErrors(points, keep=(), budget=None):
+    '''
+    Ranks samples of (3, n) points (or [x, y, z] vector) for
+    Ramer-Douglas-Peucker simplification. Returns array of errors,
+    sample is kept by simplification with tolerance eps when its
+    error is greater than eps. First, last and keep samples
+    (e.g. segment joints) have infinite error.
+
+    Simplification is run level by level: all intervals of a level
+    are split at their farthest samples at once. With budget, intervals
+    which cannot contain any of budget largest errors are not split
+    (their samples keep zero error). Curves much longer than budget
+    are first split into budget/4 equal parts (RDP can take a level
+    per few samples on long helices), their breaks are kept.
+    '''
+    points = np.asarray(points, dtype=float).T
+    n = len(points)
+    errors = np.zeros(n)
+    fixed = np.unique(np.concatenate(([0, n - 1], keep))).astype(np.intp)
+    errors[fixed] = np.inf
+
+    if budget is not None and n > 8*budget:
+        seeds = np.arange(0, n, 4*n//budget)
+        fixed = np.union1d(fixed, seeds)
+        errors[seeds] = np.inf
+
+    starts, stops = fixed[:-1], fixed[1:]
+    bounds = np.full(starts.size, np.inf)
+    while True:
+        inner = (stops - starts > 1) & (bounds > 0)
+        starts, stops, bounds = starts[inner], stops[inner], bounds[inner]
+        if not starts.size:
+            return errors
+
+        # interior samples of every interval, grouped by interval
+        sizes = stops - starts - 1
+        groups = np.repeat(np.arange(starts.size), sizes)
+        samples = (
+            np.arange(groups.size) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            + starts[groups] + 1
+        )
+        distances = pointsSegmentsDistance(
+            points[samples], points[starts[groups]], points[stops[groups]]
+        )
+
+        maxima, first = _firstMaxima(distances, groups, starts.size)
+        # sample is kept only together with its ancestors
+        bounds = np.minimum(maxima, bounds)
+        middles = samples[first]
+        errors[middles] = bounds
+
+        if budget is not None and budget < n:
+            # errors in interval are at most its bound
+            smallest = np.partition(errors, n - budget)[n - budget]
+            bounds[bounds <= smallest] = 0
+
+        starts, stops, bounds = (
+            np.concatenate((starts, middles)),
+            np.concatenate((middles, stops)),
+            np.concatenate((bounds, bounds))
+        )
+
+
+def decimate(points, budget, keep=()):
+    '''
+    Returns sorted indexes of at most budget samples of (3, n) points
+    (or [x, y, z] vector) kept by 3D Ramer-Douglas-Peucker
+    simplification with the smallest tolerance fitting in budget.
+    First, last and keep samples are always kept (even above budget).
+    '''
+    errors = simplificationErrors(points, keep, budget)
+    if errors.size <= budget:
+        return np.arange(errors.size)
+    kept = np.argpartition(-errors, budget - 1)[:budget]
+    kept = kept[errors[kept] > 0]
+    fixed = np.flatnonzero(np.isinf(errors))
+    return np.union1d(kept, fixed)
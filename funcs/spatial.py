@@ -0,0 +1,205 @@
+import numpy as np
+
+_INTERSECTION_DTYPE = np.dtype([
+    ('i', np.intp), ('j', np.intp),
+    ('si', float), ('sj', float),
+    ('distance', float)
+])
+
+
+def _kdTree(*args, **kwargs):
+    # scipy.spatial is imported on first use, it takes
+    # most of the funcs import time
+    from scipy.spatial import cKDTree
+    return cKDTree(*args, **kwargs)
+
+
+def _dot(a, b):
+    return np.einsum('ij,ij->i', a, b)
+
+
+def _safeDivide(a, b):
+    return np.divide(a, b, out=np.zeros_like(a), where=b > 1e-300)
+
+
+def segmentsDistance(p1, q1, p2, q2):
+    '''
+    Returns minimal distances between segments p1-q1 and p2-q2,
+    all arguments are (k, 3) arrays of segments ends.
+    '''
+    d1 = q1 - p1
+    d2 = q2 - p2
+    r = p1 - p2
+    a = _dot(d1, d1)
+    e = _dot(d2, d2)
+    b = _dot(d1, d2)
+    c = _dot(d1, r)
+    f = _dot(d2, r)
+
+    # closest points of infinite lines, clamped to first segment
+    s = np.clip(_safeDivide(b*f - c*e, a*e - b*b), 0, 1)
+    t = _safeDivide(b*s + f, e)
+
+    # clamp t to second segment and recompute s for clamped t
+    below = t < 0
+    above = t > 1
+    t = np.clip(t, 0, 1)
+    s = np.where(below, np.clip(_safeDivide(-c, a), 0, 1), s)
+    s = np.where(above, np.clip(_safeDivide(b - c, a), 0, 1), s)
+
+    closest1 = p1 + d1*s[:, None]
+    closest2 = p2 + d2*t[:, None]
+    return np.linalg.norm(closest1 - closest2, axis=1)
+
+
+def pointsSegmentsDistance(points, p, q):
+    '''
+    Returns distances between (k, 3) points and p-q segments.
+    '''
+    d = q - p
+    t = np.clip(_safeDivide(_dot(points - p, d), _dot(d, d)), 0, 1)
+    return np.linalg.norm(points - p - d*t[:, None], axis=1)
+
+
+class SpatialIndex(object):
+
+    '''
+    KD-tree over sampled curve points. Track is treated as polyline,
+    segment i lies between samples i and i+1.
+    '''
+
+    def __init__(self, points, leafsize=16):
+        # points is [x, y, z] vector or (3, n) array
+        self._points = np.ascontiguousarray(
+            np.asarray(points, dtype=float).T
+        )
+        self._tree = _kdTree(self._points, leafsize=leafsize)
+
+        steps = np.linalg.norm(np.diff(self._points, axis=0), axis=1)
+        self.s = np.concatenate(([0], np.cumsum(steps)))
+        self._maxStep = steps.max() if steps.size else 0
+
+    def nearest(self, points, k=1):
+        '''
+        Returns distances and indexes of k nearest samples
+        for every point in (m, 3) array.
+        '''
+        return self._tree.query(np.atleast_2d(points), k=k)
+
+    def radius(self, points, r):
+        '''
+        Returns array of indexes of samples closer than r
+        for every point in (m, 3) array.
+        '''
+        return self._tree.query_ball_point(
+            np.atleast_2d(points), r, return_sorted=True
+        )
+
+    def clearance(self, points, k=4, spacing=None):
+        '''
+        Returns distances from every point in (m, 3) array to
+        track polyline. Only segments around k nearest samples are
+        checked. With spacing, polyline through samples spacing apart
+        along track is used, which is much faster for dense tracks.
+        '''
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        if spacing is None:
+            track, tree = self._points, self._tree
+        else:
+            track = self._points[self._knots(spacing)]
+            tree = _kdTree(track)
+
+        k = min(k, len(track))
+        _, idx = tree.query(points, k=k)
+        idx = np.reshape(idx, (len(points), -1))
+
+        last = len(track) - 1
+        result = np.full(len(points), np.inf)
+        for start in (idx - 1, idx):
+            start = np.clip(start, 0, max(last - 1, 0))
+            for column in start.T:
+                result = np.minimum(result, pointsSegmentsDistance(
+                    points, track[column], track[np.minimum(column + 1, last)]
+                ))
+        return result
+
+    def segmentPairsDistance(self, i, j):
+        '''
+        Returns distances between segments i and j of track.
+        '''
+        last = len(self._points) - 1
+        i = np.asarray(i)
+        j = np.asarray(j)
+        return segmentsDistance(
+            self._points[i], self._points[np.minimum(i + 1, last)],
+            self._points[j], self._points[np.minimum(j + 1, last)]
+        )
+
+    def _knots(self, spacing):
+        '''
+        Returns indexes of samples at least spacing apart along
+        track (all samples, when they are sparser), with first
+        and last sample.
+        '''
+        grid = np.arange(0, self.s[-1], spacing)
+        knots = np.unique(np.searchsorted(self.s, grid, side='right') - 1)
+        if knots[-1] != len(self._points) - 1:
+            knots = np.append(knots, len(self._points) - 1)
+        return knots
+
+    def selfIntersections(self, clearance, skip=None, spacing=None):
+        '''
+        Returns structured array of track parts (i, j) closer than
+        clearance, with their arc length positions si, sj and distance.
+        Parts closer than skip along the track are ignored, by default
+        skip is pi*clearance.
+
+        Distances are measured between segments of polyline through
+        samples spacing apart (clearance/8 by default), so the number
+        of close pairs checked for every sample does not depend on
+        sampling density. i and j are indexes of samples starting
+        these segments.
+        '''
+        if skip is None:
+            skip = np.pi*clearance
+        if spacing is None:
+            spacing = clearance/8
+        result = np.zeros(0, dtype=_INTERSECTION_DTYPE)
+        if len(self._points) < 2:
+            return result
+
+        knots = self._knots(spacing)
+        points = self._points[knots]
+        s = self.s[knots]
+        nsegments = len(knots) - 1
+
+        pairs = _kdTree(points).query_pairs(
+            clearance + np.diff(s).max(), output_type='ndarray'
+        )
+
+        # segments on both sides of every close samples pair
+        candidates = np.concatenate([
+            np.stack((pairs[:, 0] + di, pairs[:, 1] + dj), axis=1)
+            for di in (-1, 0) for dj in (-1, 0)
+        ])
+        candidates.sort(axis=1)
+        valid = (candidates[:, 0] >= 0) & (candidates[:, 1] < nsegments)
+        candidates = np.unique(candidates[valid], axis=0)
+
+        i, j = candidates[:, 0], candidates[:, 1]
+        far = s[j] - s[i + 1] > skip
+        i, j = i[far], j[far]
+
+        distance = segmentsDistance(
+            points[i], points[i + 1], points[j], points[j + 1]
+        )
+        close = distance < clearance
+        i, j = i[close], j[close]
+
+        result = np.empty(i.size, dtype=_INTERSECTION_DTYPE)
+        result['i'] = knots[i]
+        result['j'] = knots[j]
+        result['si'] = s[i]
+        result['sj'] = s[j]
+        result['distance'] = distance[close]
+        return result
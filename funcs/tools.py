@@ -1,8 +1,18 @@
+from functools import lru_cache
+import sys
+
 import numpy as np
-from scipy.misc import derivative
-import matplotlib as mpl
-from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
-import matplotlib.pyplot as plt
+
+from .export import exportSimulink
+from .instrument import stage
+from .sampling import decimate
+from .frames import (
+    _DX, _centralDifference, frenetFrames, framesFromDerivatives,
+    frameMatrices, rotationMinimizingFrames
+)
+
+# axes narrower than this part of the widest one are flat
+_FLAT = 1e-9
 
 _GLOBALSYSTEM = (
     np.array([1, 0, 0]),
@@ -11,50 +21,98 @@ _GLOBALSYSTEM = (
 )
 
 
+@lru_cache(maxsize=32)
+def _hermiteBasis(n):
+    '''
+    Returns read only (n, 4) array with cubic hermite basis
+    for point1, slope1, point2 and slope2 in n points of [0, 1].
+    '''
+    t = np.linspace(0, 1, n)
+    t2 = t*t
+    t3 = t2*t
+
+    basis = np.empty((n, 4))
+    basis[:, 0] = 2*t3 - 3*t2 + 1
+    basis[:, 1] = t3 - 2*t2 + t
+    basis[:, 2] = -2*t3 + 3*t2
+    basis[:, 3] = t3 - t2
+    basis.setflags(write=False)
+
+    return basis
+
+
+def trackTransitonCurves(points1, slopes1, points2, slopes2, n=100):
+    '''
+    Creates k u^3 parabolas at once. Takes (k, 3) arrays of start
+    points, start slopes, end points and end slopes.
+    Returns (k, n, 3) array of [x, y, z] points.
+    '''
+    controls = np.stack(
+        [
+            np.asarray(vectors, dtype=float).reshape(-1, 3)
+            for vectors in (points1, slopes1, points2, slopes2)
+        ],
+        axis=1
+    )
+    return np.matmul(_hermiteBasis(n), controls)
+
+
 def trackTransitonCurve(point1, slope1, point2, slope2, n=100):
-        '''
-        Creates u^3 paraboal [x, y, z] vector from
-        point1 to point2 with given slopes.
-        '''
-        t = np.linspace(0, 1, n)
-        M = np.matrix(
-            [
-                [0, 0, 0, 1],
-                [0, 0, 1, 0],
-                [1, 1, 1, 1],
-                [3, 2, 1, 0]
-            ],
-            dtype=float
-        )
-        P = np.matrix(
-            [
-                point1,
-                slope1,
-                point2,
-                slope2
-            ],
-            dtype=float
+    '''
+    Creates u^3 paraboal [x, y, z] vector from
+    point1 to point2 with given slopes.
+    '''
+    curve = np.ascontiguousarray(
+        trackTransitonCurves(point1, slope1, point2, slope2, n=n)[0].T
+    )
+
+    return (curve[0], curve[1], curve[2])
+
+
+def _segmentRows(segment):
+    '''
+    Returns x, y, z arrays of segment which is Curve object
+    or [x, y, z] vector.
+    '''
+    if hasattr(segment, 'returnXarray'):
+        return (
+            segment.returnXarray(),
+            segment.returnYarray(),
+            segment.returnZarray()
         )
-        X = M**(-1) * P
+    return segment
 
-        a = np.array(X[0].transpose()*(t**3))
-        b = np.array(X[1].transpose()*(t**2))
-        c = np.array(X[2].transpose()*(t))
-        d = np.array(X[3].transpose()*(t*0+1))
 
-        curve = a + b + c + d
+def joinSegments(segments, shareJoints=True):
+    '''
+    Joins segments (Curve objects or [x, y, z] vectors) into one
+    preallocated (3, N) array. With shareJoints last point of every
+    segment but the last one is dropped, because it is the same as
+    first point of next segment.
+    Returns tuple with points array and array of segment offsets,
+    segment i is in points[:, offsets[i]:offsets[i+1]].
+    '''
+    rows = [_segmentRows(segment) for segment in segments]
+    lengths = np.array([len(row[0]) for row in rows], dtype=np.intp)
+    if shareJoints and lengths.size:
+        lengths[:-1] = np.maximum(lengths[:-1] - 1, 0)
+
+    offsets = np.zeros(len(rows) + 1, dtype=np.intp)
+    np.cumsum(lengths, out=offsets[1:])
+
+    points = np.empty((3, offsets[-1]))
+    for row, start, stop in zip(rows, offsets[:-1], offsets[1:]):
+        for axis in range(3):
+            points[axis, start:stop] = row[axis][:stop - start]
 
-        return (curve[0], curve[1], curve[2])
+    return (points, offsets)
 
 
 def printToSimulink(points):
     '''
     Printing points to copy to simulink simscape model.
     '''
-    print('[')
-    for x, y, z in zip(points[0], points[1], points[2]):
-        print('{}, {}, {};'.format(x, y, z))
-    print(']')
+    exportSimulink(points, sys.stdout)
 
 
 def frenetFromPfuncs(t, xfunc, yfunc, zfunc):
@@ -62,24 +120,12 @@ def frenetFromPfuncs(t, xfunc, yfunc, zfunc):
     Takes t parameter and three x, y, z parametrs funcs.
     Returns tuple with three frenet's p, n, b, unit vectors in t parameter.
     '''
-    p = np.array([
-        derivative(xfunc, t, dx=10e-6, n=1),
-        derivative(yfunc, t, dx=10e-6, n=1),
-        derivative(zfunc, t, dx=10e-6, n=1)
-    ])
-    p = p/np.linalg.norm(p)
+    funcs = (xfunc, yfunc, zfunc)
+    d1 = [_centralDifference(func, t, _DX, 1) for func in funcs]
+    d2 = [_centralDifference(func, t, _DX, 2) for func in funcs]
+    p, n, b = framesFromDerivatives(d1, d2)
 
-    n = np.array([
-        derivative(xfunc, t, dx=10e-6, n=2),
-        derivative(yfunc, t, dx=10e-6, n=2),
-        derivative(zfunc, t, dx=10e-6, n=2)
-    ])
-    n = n/np.linalg.norm(n)
-
-    b = np.cross(p, n)
-    b = b/np.linalg.norm(b)
-
-    return (p, n, b)
+    return (p[0], n[0], b[0])
 
 
 def _calcCos(veca, vecb):
@@ -91,16 +137,14 @@ def _calcCos(veca, vecb):
     )
 
 
-def curveByCurve(linspace, basefuncs, curfuncs):
+def _curveByCurvePointwise(linspace, basefuncs, curfuncs):
     '''
-    Returns [x, y, z] vector of curfuncs curve in local
-    coordinate system of basefuncs in given linspace.
+    curveByCurve evaluated point by point, for funcs which
+    can not take whole numpy array as an argument.
     '''
-    xnew = np.array([])
-    ynew = np.array([])
-    znew = np.array([])
+    result = np.empty((3, len(linspace)))
     xb, yb, zb = _GLOBALSYSTEM
-    for t in linspace:
+    for i, t in enumerate(linspace):
         posbase = np.array([
             basefuncs[0](t), basefuncs[1](t), basefuncs[2](t)
         ])
@@ -117,28 +161,143 @@ def curveByCurve(linspace, basefuncs, curfuncs):
             ]
         )
 
-        rotated = np.matmul(transmatrix, poscurv)
+        result[:, i] = np.matmul(transmatrix, poscurv) + posbase
 
-        xnew = np.append(xnew, rotated[0] + posbase[0])
-        ynew = np.append(ynew, rotated[1] + posbase[1])
-        znew = np.append(znew, rotated[2] + posbase[2])
+    return (result[0], result[1], result[2])
 
-    return (xnew, ynew, znew)
 
+def curveByCurve(linspace, basefuncs, curfuncs, batched=True, frame='frenet'):
+    '''
+    Returns [x, y, z] vector of curfuncs curve in local
+    coordinate system of basefuncs in given linspace.
 
-# TODO: create a function for easy visualization of track
-def trackVisualize(xvec, yvec, zvec, setnormaxes=False, boundaryfactor=0.1):
-    mpl.rcParams['legend.fontsize'] = 10
-    fig = plt.figure()
-    ax = fig.gca(projection='3d')
-    ax.plot(xvec, yvec, zvec, label='parametric curve')
+    With batched=True every func is called once with whole linspace
+    array and all frames are applied in one pass. Use batched=False
+    for funcs which accept only scalar parameter.
+
+    frame='frenet' uses frenet's frames of base curve, frame='rmf'
+    rotation minimizing frames (see rotationMinimizingFrames), which
+    do not flip on straight parts and inflections. They start with
+    frenet's frame and are transported along linspace samples, so
+    they depend on whole linspace (not only on single t).
+    '''
+    if frame not in ('frenet', 'rmf'):
+        raise ValueError('unknown frame: {}'.format(frame))
+    if not batched:
+        if frame == 'frenet':
+            return _curveByCurvePointwise(linspace, basefuncs, curfuncs)
+        basefuncs = [np.vectorize(func) for func in basefuncs]
+        curfuncs = [np.vectorize(func) for func in curfuncs]
+
+    t = np.asarray(linspace, dtype=float)
+    with stage('curveByCurve', points=t.size):
+        result = np.empty((3, t.size))
+        for axis, func in enumerate(basefuncs):
+            result[axis] = func(t)
+
+        p, n, b = frenetFrames(t, basefuncs)
+        if frame == 'rmf':
+            p, n, b = rotationMinimizingFrames(result.T, p, n[0])
+        frames = frameMatrices(p, n, b)
+
+        poscurv = np.empty((t.size, 3))
+        for axis, func in enumerate(curfuncs):
+            poscurv[:, axis] = func(t)
+
+        result += np.einsum('kij,kj->ik', frames, poscurv)
+
+    return (result[0], result[1], result[2])
+
+
+def _axesLimits(points, setnormaxes, boundaryfactor):
+    '''
+    Returns (3, 2) array of x, y, z limits of (3, n) points. With
+    setnormaxes all axes get the same limits. Flat axes (e.g. y of
+    planar curve) get span of the widest one around their center,
+    as equal limits collapse axis.
+    '''
+    limits = np.stack(
+        (np.nanmin(points, axis=1), np.nanmax(points, axis=1)), axis=1
+    )
     if setnormaxes:
-        minlim = min(
-            min(xvec), min(yvec), min(zvec)
-        )
-        maxlim = max(
-            max(xvec), max(yvec), max(zvec)
-        )
-        minlim -= abs(minlim)*boundaryfactor
-        maxlim += abs(maxlim)*boundaryfactor
+        limits[:] = (limits[:, 0].min(), limits[:, 1].max())
+    spans = limits[:, 1] - limits[:, 0]
+    widest = spans.max() if spans.max() > 0 else 1.0
+    flat = spans <= _FLAT*widest
+    limits[flat] = (
+        limits[flat].mean(axis=1, keepdims=True)
+        + 0.5*widest*np.array([-1, 1])
+    )
+    limits += np.abs(limits)*boundaryfactor*np.array([-1, 1])
+    return limits
+
+
+def tracksVisualize(
+    curves, joints=None, budget=None, setnormaxes=False,
+    boundaryfactor=0.1, ax=None, **kwargs
+):
+    '''
+    Draws curves ((m, 3, n) array, e.g. sweep results, or list
+    of [x, y, z] vectors) in one 3D line collection and returns axes.
+
+    With budget, all curves together are decimated to about budget
+    points by 3D polyline simplification (see decimate), points
+    get to curves where they matter most. joints is list of sample
+    indexes for every curve (e.g. segment offsets) which are kept.
+    kwargs are passed to Line3DCollection (color, label, ...).
+    '''
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+    curves = [np.asarray(curve, dtype=float) for curve in curves]
+    sizes = np.array([curve.shape[1] for curve in curves])
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    points = np.concatenate(curves, axis=1)
+
+    # polylines are decimated as one, their ends are kept
+    keep = [starts, starts + sizes - 1]
+    for start, size, kept in zip(starts, sizes, joints or ()):
+        kept = np.asarray(kept, dtype=np.intp)
+        keep.append(start + kept[kept < size])
+    keep = np.concatenate(keep)
+    with stage('tracksVisualize', points=points.shape[1]):
+        if budget is None:
+            kept = np.arange(points.shape[1])
+        else:
+            kept = decimate(points, budget, keep)
+        owners = np.searchsorted(starts, kept, side='right')
+        links = owners[:-1] == owners[1:]
+        segments = np.stack(
+            (points[:, kept[:-1]].T, points[:, kept[1:]].T), axis=1
+        )[links]
+
+    if ax is None:
+        ax = plt.figure().add_subplot(projection='3d')
+    ax.add_collection3d(Line3DCollection(segments, **kwargs))
+    # collections do not update data limits in 3D
+    limits = _axesLimits(points, setnormaxes, boundaryfactor)
+    ax.set_xlim(*limits[0])
+    ax.set_ylim(*limits[1])
+    ax.set_zlim(*limits[2])
+    return ax
+
+
+def trackVisualize(
+    xvec, yvec, zvec, setnormaxes=False, boundaryfactor=0.1,
+    budget=None, joints=(), ax=None, label='parametric curve'
+):
+    '''
+    Draws curve and returns axes. With budget curve is decimated
+    to about budget points, joints samples are kept.
+    '''
+    # matplotlib is imported on first call, so geometry
+    # can be used (and imported quickly) without it
+    import matplotlib as mpl
+
+    mpl.rcParams['legend.fontsize'] = 10
+    ax = tracksVisualize(
+        [(xvec, yvec, zvec)], [joints], budget, setnormaxes,
+        boundaryfactor, ax, label=label
+    )
     ax.legend()
+    return ax
@@ -0,0 +1,134 @@
+import numpy as np
+
+_AXES = {'x': (1, 0, 0), 'y': (0, 1, 0), 'z': (0, 0, 1)}
+
+
+def _direction(axis):
+    '''
+    Returns unit vector of axis name ('x', 'y', 'z') or vector.
+    '''
+    if isinstance(axis, str):
+        axis = _AXES[axis]
+    vector = np.asarray(axis, dtype=float)
+    return vector/np.linalg.norm(vector)
+
+
+class AffineTransform(object):
+
+    '''
+    Affine transform of 3D points kept as one 4x4 matrix (identity
+    by default). Transforms are immutable, translate, rotate, mirror
+    and scale return new transform which applies them after this one,
+    a @ b is transform which applies b first. Points are transformed
+    by whole matrix, derivatives (vectors) only by its linear part.
+    '''
+
+    def __init__(self, matrix=None):
+        self.matrix = np.eye(4) if matrix is None else np.array(
+            matrix, dtype=float
+        ).reshape(4, 4)
+        self.matrix.flags.writeable = False
+
+    def __matmul__(self, other):
+        return AffineTransform(self.matrix @ other.matrix)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, AffineTransform)
+            and np.array_equal(self.matrix, other.matrix)
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'AffineTransform({})'.format(self.matrix.tolist())
+
+    @property
+    def linear(self):
+        return self.matrix[:3, :3]
+
+    @property
+    def translation(self):
+        return self.matrix[:3, 3]
+
+    def isIdentity(self):
+        return np.array_equal(self.matrix, np.eye(4))
+
+    def _then(self, linear=None, translation=None, center=None):
+        step = np.eye(4)
+        if linear is not None:
+            step[:3, :3] = linear
+            if center is not None:
+                center = np.asarray(center, dtype=float)
+                step[:3, 3] = center - step[:3, :3] @ center
+        if translation is not None:
+            step[:3, 3] += np.asarray(translation, dtype=float)[:3]
+        return AffineTransform(step @ self.matrix)
+
+    def translate(self, vector):
+        return self._then(translation=vector)
+
+    def rotate(self, angle, axis='z', center=None):
+        '''
+        Rotation by angle (radians, right hand rule) around axis
+        ('x', 'y', 'z' or vector) going through center (origin).
+        '''
+        u = _direction(axis)
+        cross = np.array([
+            [0, -u[2], u[1]],
+            [u[2], 0, -u[0]],
+            [-u[1], u[0], 0]
+        ])
+        linear = (
+            np.cos(angle)*np.eye(3) + np.sin(angle)*cross
+            + (1 - np.cos(angle))*np.outer(u, u)
+        )
+        return self._then(linear, center=center)
+
+    def mirror(self, normal, point=None):
+        '''
+        Reflection in plane with normal ('x', 'y', 'z' or vector)
+        going through point (origin).
+        '''
+        u = _direction(normal)
+        return self._then(np.eye(3) - 2*np.outer(u, u), center=point)
+
+    def scale(self, factor, center=None):
+        '''
+        Scaling by factor (or x, y, z factors) from center (origin).
+        '''
+        factors = np.broadcast_to(np.asarray(factor, dtype=float), (3,))
+        if not factors.all():
+            raise ValueError('scale factor must not be zero')
+        return self._then(np.diag(factors), center=center)
+
+    def inverse(self):
+        linear = self.linear
+        if not np.array_equal(linear, np.eye(3)):
+            linear = np.linalg.inv(linear)
+        matrix = np.eye(4)
+        matrix[:3, :3] = linear
+        matrix[:3, 3] = -(linear @ self.translation)
+        return AffineTransform(matrix)
+
+    def applyPoints(self, points):
+        '''
+        Returns (3, n) array of transformed (3, n) points,
+        in one batched multiply.
+        '''
+        points = np.asarray(points, dtype=float)
+        if self.isIdentity():
+            return points
+        if np.array_equal(self.linear, np.eye(3)):
+            return points + self.translation.reshape(3, 1)
+        return self.linear @ points + self.translation.reshape(3, 1)
+
+    def applyVectors(self, vectors):
+        '''
+        Returns (3, n) array of transformed (3, n) vectors
+        (e.g. derivatives), translation does not move them.
+        '''
+        vectors = np.asarray(vectors, dtype=float)
+        if np.array_equal(self.linear, np.eye(3)):
+            return vectors
+        return self.linear @ vectors
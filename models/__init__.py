@@ -1,11 +1,18 @@
 from .curve import Curve, ParametricCurve
 from .curves import (
     HelixCircleParam, InvHelixCircleParam, Line,
-    SingleLoop, DoubleLoop, Hill, TransitionHelix
+    SingleLoop, DoubleLoop, Hill, TransitionHelix, Track
 )
+from .store import saveTrack, loadTrack, StoredCurve
+from .layout import loadLayout, layoutCurves, layoutChunks, layoutTrack
+from .sweep import sweep, sweepCases
+from .cache import CurveCache, cachedCurve, enableCache, disableCache
 
 __all__ = [
     'Curve', 'ParametricCurve', 'HelixCircleParam',
     'InvHelixCircleParam', 'Line', 'SingleLoop',
-    'DoubleLoop', 'Hill', 'TransitionHelix'
+    'DoubleLoop', 'Hill', 'TransitionHelix', 'Track',
+    'saveTrack', 'loadTrack', 'StoredCurve', 'loadLayout', 'layoutCurves',
+    'layoutChunks', 'layoutTrack', 'sweep', 'sweepCases',
+    'CurveCache', 'cachedCurve', 'enableCache', 'disableCache'
 ]
@@ -0,0 +1,213 @@
+from collections import OrderedDict
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+
+from rollerpy import __version__
+from rollerpy.models.curve import Curve, ParametricCurve, _slotNames
+from rollerpy.models.store import _encode, saveTrack, loadTrack
+
+_defaultCache = None
+
+
+def _directoryBytes(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path) for name in names
+    )
+
+
+def _detached(curve):
+    '''
+    Returns copy of curve with copies of its nested curves (like
+    segments of Track), so changing them does not change other copies.
+    '''
+    curve = curve.copy()
+    for name in _slotNames(type(curve)):
+        value = getattr(curve, name, None)
+        if isinstance(value, Curve):
+            setattr(curve, name, _detached(value))
+        elif isinstance(value, list) and any(
+            isinstance(item, Curve) for item in value
+        ):
+            setattr(curve, name, type(value)(
+                _detached(item) if isinstance(item, Curve) else item
+                for item in value
+            ))
+    return curve
+
+
+class CurveCache(object):
+
+    '''
+    Memoization cache for curve construction. Curves are keyed
+    by their class, constructor arguments and library version.
+    Built curves are kept in memory (least recently used are dropped
+    above maxBytes) and, with directory, stored on disk with
+    saveTrack (least recently used are removed above maxDiskBytes).
+    Disk hits return curve of the same class with memory mapped
+    arrays (see StoredCurve.rebuild).
+    '''
+
+    def __init__(
+        self, maxBytes=256*2**20, directory=None, maxDiskBytes=2**30
+    ):
+        self._maxBytes = maxBytes
+        self._directory = directory
+        self._maxDiskBytes = maxDiskBytes
+
+        self._memory = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.diskHits = 0
+        self.misses = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(curveClass, *args, **kwargs):
+        '''
+        Returns hash of class, canonical constructor
+        arguments and library version.
+        '''
+        bound = inspect.signature(curveClass.__init__).bind(
+            None, *args, **kwargs
+        )
+        bound.apply_defaults()
+        parameters = dict(bound.arguments)
+        parameters.pop(next(iter(parameters)))
+
+        description = json.dumps(
+            [
+                curveClass.__module__, curveClass.__qualname__,
+                __version__, _encode(parameters)
+            ],
+            sort_keys=True, separators=(',', ':')
+        )
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'diskHits': self.diskHits,
+            'misses': self.misses,
+            'entries': len(self._memory),
+            'bytes': self._bytes
+        }
+
+    def clear(self):
+        self._memory.clear()
+        self._bytes = 0
+        if self._directory is not None:
+            shutil.rmtree(self._directory)
+            os.makedirs(self._directory)
+
+    def build(self, curveClass, *args, **kwargs):
+        '''
+        Returns curveClass(*args, **kwargs), from cache if possible.
+        Returned curve is a copy of cached one with its own copies
+        of nested curves (segments). Its points and derivatives are
+        read only views shared with the cache (memory mapped ones
+        on disk hit), they are copied when the copy writes to them.
+        '''
+        key = self.key(curveClass, *args, **kwargs)
+
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return _detached(self._memory[key][0])
+
+        curve = self._loadFromDisk(key)
+        if curve is not None:
+            self.diskHits += 1
+        else:
+            self.misses += 1
+            curve = curveClass(*args, **kwargs)
+            # calculating everything now and making arrays read
+            # only, so copies share them
+            curve.x
+            if isinstance(curve, ParametricCurve):
+                curve.dx
+            for block in (curve._points, getattr(curve, '_derivatives', None)):
+                if block is not None:
+                    block.flags.writeable = False
+            self._saveToDisk(key, curve)
+
+        self._remember(key, curve)
+        return _detached(curve)
+
+    def _remember(self, key, curve):
+        size = curve.returnNbytes()
+        if size > self._maxBytes:
+            return
+        self._memory[key] = (curve, size)
+        self._bytes += size
+        while self._bytes > self._maxBytes:
+            _, (_, dropped) = self._memory.popitem(last=False)
+            self._bytes -= dropped
+
+    def _loadFromDisk(self, key):
+        if self._directory is None:
+            return None
+        path = os.path.join(self._directory, key)
+        if not os.path.isdir(path):
+            return None
+        # modification time is used as last use time for eviction
+        os.utime(path)
+        return loadTrack(path).rebuild(arrays=True)
+
+    def _saveToDisk(self, key, curve):
+        if self._directory is None:
+            return
+        temporary = tempfile.mkdtemp(dir=self._directory)
+        saveTrack(curve, temporary)
+        try:
+            os.replace(temporary, os.path.join(self._directory, key))
+        except OSError:
+            # same curve was stored meanwhile by other process
+            shutil.rmtree(temporary, ignore_errors=True)
+        self._evictDisk()
+
+    def _evictDisk(self):
+        entries = [
+            os.path.join(self._directory, name)
+            for name in os.listdir(self._directory)
+        ]
+        entries.sort(key=os.path.getmtime)
+        sizes = [_directoryBytes(entry) for entry in entries]
+        total = sum(sizes)
+        for entry, size in zip(entries, sizes):
+            if total <= self._maxDiskBytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+def enableCache(**kwargs):
+    '''
+    Turns on default cache used by cachedCurve,
+    kwargs are passed to CurveCache.
+    '''
+    global _defaultCache
+    _defaultCache = CurveCache(**kwargs)
+    return _defaultCache
+
+
+def disableCache():
+    global _defaultCache
+    _defaultCache = None
+
+
+def cachedCurve(curveClass, *args, **kwargs):
+    '''
+    Returns curveClass(*args, **kwargs), built through default
+    cache when it is enabled with enableCache.
+    '''
+    if _defaultCache is None:
+        return curveClass(*args, **kwargs)
+    return _defaultCache.build(curveClass, *args, **kwargs)
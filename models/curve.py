@@ -1,27 +1,432 @@
 from abc import ABC, abstractclassmethod
+from collections import OrderedDict
+import inspect
 import numpy as np
 
+from rollerpy.funcs import (
+    ArcLengthIndex, SpatialIndex, stage, rideDynamics,
+    adaptiveSamples, rotationMinimizingFrames, jointContinuity,
+    framesFromDerivatives, AffineTransform
+)
+from rollerpy.funcs.frames import _DX, _evalDerivative
+
 
 def numpize(func):
     '''
     Changing function ouput from list (or other iter)
     to numpy array
     '''
-    def wrapper(point):
-        return np.array(func(point))
+    def wrapper(*args, **kwargs):
+        return np.array(func(*args, **kwargs))
     return wrapper
 
 
+_SAMPLE_CACHE_SIZE = 4
+
+_OUT_OF_RANGE = ('raise', 'clip', 'extrapolate', 'nan')
+
+_IDENTITY = AffineTransform()
+
+# curve slots which are not derived from constructor parameters
+_STATE_SLOTS = frozenset((
+    '_t', '_pointsBlock', '_derivativesBlock', '_pointsPlacement',
+    '_derivativesPlacement', '_pointsPlaced', '_derivativesPlaced',
+    '_dtype', '_transform',
+    '_samples', '_arcLengthIndex', '_spatialIndex'
+))
+
+
+def _slotNames(cls):
+    '''
+    Returns names of all slots of class and its bases.
+    '''
+    names = []
+    for klass in cls.__mro__:
+        slots = getattr(klass, '__slots__', ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return names
+
+
+def _writeable(block):
+    '''
+    Returns True when block can be changed in place. Memory mapped
+    blocks are taken as read only, so stored files are never changed.
+    '''
+    return block.flags.writeable and not isinstance(block, np.memmap)
+
+
+class _LazyArray(object):
+
+    '''
+    Curve array calculated with builder method on first access.
+    '''
+
+    def __init__(self, builder):
+        self._builder = builder
+
+    def __set_name__(self, owner, name):
+        self._attr = '_' + name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self._attr)
+        except AttributeError:
+            instance._runBuilder(self._builder)
+            return getattr(instance, self._attr)
+
+    def __set__(self, instance, value):
+        setattr(instance, self._attr, value)
+
+
+class _PlacedBlock(object):
+
+    '''
+    Curve (3, n) points (or derivatives, when vectors) block.
+    Raw block is kept in coordinates of its placement (curve's own
+    coordinates, unless stored arrays were attached) and transforms
+    never change it. Placed copy is calculated from raw block on
+    first access after transform of curve changed, in one batched
+    multiply, and cached. So rounding errors of transforms do not
+    accumulate, arrays returned before keep coordinates they had and
+    stored (memory mapped) blocks are never written. Set block is
+    taken as being in curve's own coordinates.
+    '''
+
+    def __init__(self, vectors=False):
+        self._vectors = vectors
+
+    def __set_name__(self, owner, name):
+        self._raw = name + 'Block'
+        self._placement = name + 'Placement'
+        self._placed = name + 'Placed'
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        block = getattr(instance, self._raw)
+        placement = getattr(instance, self._placement)
+        target = instance._transform
+        if placement is target or placement == target:
+            return block
+        placed = getattr(instance, self._placed)
+        if placed is not None and (
+            placed[0] is target or placed[0] == target
+        ):
+            return placed[1]
+
+        relative = target @ placement.inverse()
+        if self._vectors:
+            values = relative.applyVectors(block)
+        else:
+            values = relative.applyPoints(block)
+        values = np.ascontiguousarray(values, dtype=instance._dtype)
+        setattr(instance, self._placed, (target, values))
+        return values
+
+    def __set__(self, instance, value):
+        setattr(instance, self._raw, value)
+        setattr(instance, self._placement, _IDENTITY)
+        setattr(instance, self._placed, None)
+
+    def __delete__(self, instance):
+        delattr(instance, self._raw)
+        setattr(instance, self._placement, _IDENTITY)
+        setattr(instance, self._placed, None)
+
+
+class _LazyRow(object):
+
+    '''
+    Row of curve (3, n) block calculated with builder method on
+    first access. Rows are views of the same contiguous block.
+    Set row is taken as being in curve's own coordinates, it is
+    written into raw block (copied first when it is read only or
+    in other coordinates). Setting row with different length
+    allocates new block.
+    '''
+
+    def __init__(self, block, row, builder):
+        self._block = block
+        self._raw = block + 'Block'
+        self._row = row
+        self._builder = builder
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        block = getattr(instance, self._block, None)
+        if block is None:
+            instance._runBuilder(self._builder)
+            block = getattr(instance, self._block)
+        return block[self._row]
+
+    def __set__(self, instance, value):
+        block = getattr(instance, self._raw, None)
+        if block is None or block.shape[1] != len(value):
+            block = np.empty((3, len(value)), dtype=instance._dtype)
+            setattr(instance, self._block, block)
+        else:
+            block = instance._editableBlock(self._block)
+        block[self._row] = value
+
+
 class Curve(ABC):
 
     '''
     A simple curve abstract class.
+
+    Curve keeps only its parameters after creation, x, y, z and t
+    arrays are calculated on first access. Points (and derivatives)
+    are kept in one contiguous (3, n) block, x, y, z are its rows.
+
+    Curve is placed with affine transform (translate, rotate, mirror,
+    scale), which is only composed with the current one. It is applied
+    to arrays when they are read, closed forms and interpolants stay
+    in curve's own coordinates.
     '''
 
+    __slots__ = (
+        '_t', '_pointsBlock', '_derivativesBlock', '_pointsPlacement',
+        '_derivativesPlacement', '_pointsPlaced', '_derivativesPlaced',
+        '_dtype', '_transform', '_initArgs', '_samples', '_arcLengthIndex',
+        '_spatialIndex'
+    )
+
+    _points = _PlacedBlock()
+    _derivatives = _PlacedBlock(vectors=True)
+
+    t = _LazyArray('_buildParameters')
+    x = _LazyRow('_points', 0, '_buildParameters')
+    y = _LazyRow('_points', 1, '_buildParameters')
+    z = _LazyRow('_points', 2, '_buildParameters')
+
+    def __new__(cls, *args, **kwargs):
+        curve = super().__new__(cls)
+        curve._initArgs = (args, kwargs)
+        curve._dtype = np.dtype(float)
+        curve._transform = _IDENTITY
+        curve._pointsPlacement = _IDENTITY
+        curve._derivativesPlacement = _IDENTITY
+        curve._pointsPlaced = None
+        curve._derivativesPlaced = None
+        curve._samples = OrderedDict()
+        curve._arcLengthIndex = None
+        curve._spatialIndex = None
+        return curve
+
     @abstractclassmethod
     def _calcParameters(self):
         raise NotImplementedError
 
+    def returnParameters(self):
+        '''
+        Returns dict with constructor arguments of curve,
+        default values included.
+        '''
+        args, kwargs = self._initArgs
+        bound = inspect.signature(type(self).__init__).bind(
+            self, *args, **kwargs
+        )
+        bound.apply_defaults()
+        parameters = dict(bound.arguments)
+        del parameters['self']
+        return parameters
+
+    def _edited(self, changes):
+        '''
+        Returns new, not calculated curve with constructor
+        parameters of this one updated with changes.
+        '''
+        parameters = self.returnParameters()
+        unknown = set(changes) - set(parameters)
+        if unknown:
+            raise TypeError('unknown parameters: {}'.format(
+                ', '.join(sorted(unknown))
+            ))
+        parameters.update(changes)
+        edited = type(self)(**parameters)
+        edited._dtype = self._dtype
+        return edited
+
+    def _adopt(self, edited, keep=()):
+        '''
+        Takes parameters state (everything but arrays, caches and
+        position) of edited curve. Slots in keep are not changed.
+        '''
+        for name in _slotNames(type(self)):
+            if name in _STATE_SLOTS or name in keep:
+                continue
+            try:
+                setattr(self, name, getattr(edited, name))
+            except AttributeError:
+                if hasattr(self, name):
+                    delattr(self, name)
+
+    def setParameters(self, **changes):
+        '''
+        Changes constructor parameters of curve, arrays are
+        calculated again on next access. Transform of curve is kept.
+        '''
+        self._adopt(self._edited(changes))
+        if hasattr(self, '_t'):
+            del self._t
+        for name in ('_points', '_derivatives'):
+            if hasattr(self, name + 'Block'):
+                delattr(self, name)
+        self._invalidate()
+        return self
+
+    def _calcParam_t(self):
+        self.t = np.linspace(self.tmin, self.tmax, self._n)
+
+    def _paramRange(self):
+        return (self.tmin, self.tmax)
+
+    def _buildParameters(self):
+        self._calcParam_t()
+        self._calcParameters()
+
+    def _runBuilder(self, builder):
+        '''
+        Runs builder method as instrumented stage.
+        '''
+        name = '{}.{}'.format(type(self).__name__, builder)
+        with stage(name, self) as record:
+            getattr(self, builder)()
+            if record is not None:
+                record.points = self._points.shape[1]
+
+    def _ensureParameters(self):
+        if getattr(self, '_points', None) is None:
+            self._runBuilder('_buildParameters')
+
+    def _setPoints(self, points):
+        '''
+        Takes (3, n) array as points block (without copy,
+        when it has curve dtype and is contiguous).
+        '''
+        self._points = np.ascontiguousarray(points, dtype=self._dtype)
+
+    def _evalParameters(self, t):
+        '''
+        Returns (3, len(t)) array of curve points in given t parameters
+        (in curve's own coordinates).
+        '''
+        funcs = self._derivativeFuncs()[0]
+        points = np.empty((3, len(t)))
+        for axis, func in enumerate(funcs):
+            points[axis] = func(t)
+        return points
+
+    def _placedPoints(self, t):
+        return self._transform.applyPoints(self._evalParameters(t))
+
+    def _localBlock(self, name):
+        '''
+        Returns '_points' or '_derivatives' block in curve's
+        own coordinates.
+        '''
+        block = getattr(self, name + 'Block')
+        placement = getattr(self, name + 'Placement')
+        if placement.isIdentity():
+            return block
+        if name == '_derivatives':
+            return placement.inverse().applyVectors(block)
+        return placement.inverse().applyPoints(block)
+
+    def _editableBlock(self, name):
+        '''
+        Returns '_points' or '_derivatives' block in curve's own
+        coordinates which can be changed in place (copied first when
+        it is read only or in other coordinates). Its placed copy
+        is dropped.
+        '''
+        block = getattr(self, name + 'Block')
+        placement = getattr(self, name + 'Placement')
+        if not _writeable(block) or not placement.isIdentity():
+            block = np.array(self._localBlock(name), dtype=self._dtype)
+        setattr(self, name, block)
+        return block
+
+    def _writeSamples(self, name, index, values):
+        '''
+        Writes (3, k) values in curve's own coordinates to index
+        samples of '_points' or '_derivatives' block, its placed
+        copy is changed in the same samples instead of being dropped.
+        '''
+        placed = getattr(self, name + 'Placed')
+        self._editableBlock(name)[:, index] = values
+        if placed is None or not _writeable(placed[1]):
+            return
+        transform, block = placed
+        if name == '_derivatives':
+            block[:, index] = transform.applyVectors(values)
+        else:
+            block[:, index] = transform.applyPoints(values)
+        setattr(self, name + 'Placed', placed)
+
+    def _attachArrays(self, t, points, derivatives=None):
+        '''
+        Takes t and (3, n) points and derivatives blocks in current
+        coordinates of curve (e.g. stored ones) as its arrays,
+        without copy.
+        '''
+        self.t = t
+        self._points = points
+        self._pointsPlacement = self._transform
+        if derivatives is not None:
+            self._derivatives = derivatives
+            self._derivativesPlacement = self._transform
+
+    def sample(self, n):
+        '''
+        Returns [x, y, z] vector of curve in n points evenly spaced
+        in t parameter. Few recently used resolutions are cached.
+        '''
+        samples = self._samples
+        if n in samples:
+            samples.move_to_end(n)
+            return samples[n]
+
+        tmin, tmax = self._paramRange()
+        points = self._placedPoints(np.linspace(tmin, tmax, n))
+        samples[n] = (points[0], points[1], points[2])
+        if len(samples) > _SAMPLE_CACHE_SIZE:
+            samples.popitem(last=False)
+
+        return samples[n]
+
+    def _jointParams(self):
+        '''
+        Returns t parameters of segments joints (if curve has them).
+        '''
+        try:
+            offsets = self.returnSegmentOffsets()
+        except AttributeError:
+            return ()
+        if offsets is None:
+            return ()
+        return self.t[offsets[:-1]]
+
+    def sampleAdaptive(self, tolerance, initial=8, maxLevels=30):
+        '''
+        Returns tuple with t array and [x, y, z] vector of curve
+        sampled densely where it turns and sparsely where it is
+        straight, so that polyline through samples deviates from
+        curve at most about tolerance (see adaptiveSamples).
+        Sampling starts with initial intervals and segments joints.
+        '''
+        breaks = np.concatenate((
+            np.linspace(*self._paramRange(), initial + 1),
+            self._jointParams()
+        ))
+        t, points = adaptiveSamples(
+            self._placedPoints, breaks, tolerance, maxLevels
+        )
+        return (t, (points[0], points[1], points[2]))
+
     def gimmePoint(self, t):
         return np.array([
             self.x[t], self.y[t], self.z[t]
@@ -51,22 +456,371 @@ class Curve(ABC):
     def returnTparam(self):
         return self.t
 
+    def returnParamRange(self):
+        return self._paramRange()
+
+    def returnArcLengthIndex(self, n=None):
+        '''
+        Returns ArcLengthIndex of curve samples, or of n evenly
+        spaced in t samples when n is given.
+        '''
+        cached = self._arcLengthIndex
+        if cached is not None and cached[0] == n:
+            return cached[1]
+
+        if n is None:
+            self._ensureParameters()
+            t, points = self.t, self._points
+            derivatives = None
+            if isinstance(self, ParametricCurve):
+                self._ensureDerivative()
+                derivatives = self._derivatives
+        else:
+            t = np.linspace(*self._paramRange(), n)
+            points, derivatives = self.sample(n), None
+
+        index = ArcLengthIndex(points, t=t, derivatives=derivatives)
+        self._arcLengthIndex = (n, index)
+        return index
+
+    def returnSpatialIndex(self):
+        '''
+        Returns (cached) SpatialIndex of curve samples.
+        '''
+        if self._spatialIndex is None:
+            self._ensureParameters()
+            self._spatialIndex = SpatialIndex(self._points)
+        return self._spatialIndex
+
+    def resampleByArcLength(self, ds):
+        '''
+        Returns [x, y, z] vector of curve points evenly spaced
+        along the curve, at most ds apart.
+        '''
+        s, points = self.returnArcLengthIndex().resample(ds=ds)
+        return (points[0], points[1], points[2])
+
+    def copy(self):
+        '''
+        Returns new curve with own copy of points and derivatives
+        blocks. Read only blocks (e.g. memory mapped or cached ones)
+        are shared, they are copied when they are changed.
+        '''
+        curve = object.__new__(type(self))
+        for name in _slotNames(type(self)):
+            try:
+                setattr(curve, name, getattr(self, name))
+            except AttributeError:
+                pass
+        for name in ('_pointsBlock', '_derivativesBlock'):
+            block = getattr(self, name, None)
+            if block is not None and _writeable(block):
+                setattr(curve, name, np.array(block))
+        curve._pointsPlaced = curve._derivativesPlaced = None
+        curve._samples = OrderedDict(self._samples)
+        return curve
+
+    def returnNbytes(self):
+        '''
+        Returns size of numpy arrays kept in memory by curve
+        (memory mapped arrays are not counted).
+        '''
+        size = 0
+        for name in _slotNames(type(self)):
+            value = getattr(self, name, None)
+            items = value if isinstance(value, (list, tuple)) else (value,)
+            for item in items:
+                if isinstance(item, np.memmap):
+                    continue
+                if isinstance(item, np.ndarray):
+                    size += item.nbytes
+                elif isinstance(item, Curve):
+                    size += item.returnNbytes()
+        return size
+
+    def setDtype(self, dtype):
+        '''
+        Sets dtype of points and derivatives blocks, e.g. np.float32
+        to halve their memory. Calculations are done in float64.
+        '''
+        self._dtype = np.dtype(dtype)
+        for name in ('_pointsBlock', '_derivativesBlock'):
+            block = getattr(self, name, None)
+            if block is not None:
+                setattr(self, name, block.astype(self._dtype))
+        self._pointsPlaced = self._derivativesPlaced = None
+        self._invalidate()
+        return self
+
+    def _dropIntermediates(self):
+        '''
+        Drops data used only during calculation of curve arrays.
+        '''
+        for name in _slotNames(type(self)):
+            value = getattr(self, name, None)
+            if isinstance(value, Curve):
+                setattr(self, name, value._unbuilt())
+
+    def _unbuilt(self):
+        '''
+        Returns the same curve (with the same transform),
+        not calculated yet.
+        '''
+        args, kwargs = self._initArgs
+        curve = type(self)(*args, **kwargs)
+        curve._dtype = self._dtype
+        curve._transform = self._transform
+        return curve
+
+    def compact(self, dtype=None):
+        '''
+        Calculates curve arrays and drops everything else (helper
+        curves, splines, cached samples and indexes), optionally
+        changing dtype. Dropped data is calculated again if needed.
+        '''
+        self._ensureParameters()
+        if isinstance(self, ParametricCurve):
+            self._ensureDerivative()
+        self._dropIntermediates()
+        if dtype is not None:
+            self.setDtype(dtype)
+        self._invalidate()
+        return self
+
+    def _invalidate(self):
+        '''
+        Drops cached data which depends on curve position.
+        '''
+        self._samples.clear()
+        self._arcLengthIndex = None
+        self._spatialIndex = None
+
+    def returnTransform(self):
+        return self._transform
+
+    def setTransform(self, transform):
+        '''
+        Sets AffineTransform of curve. Arrays are transformed when
+        they are read next time, in one multiply however many
+        transforms were composed before. Arrays returned before
+        are not changed, they have to be read again.
+        '''
+        self._transform = transform
+        self._invalidate()
+        return self
+
+    def transform(self, transform):
+        '''
+        Applies AffineTransform after current transform of curve.
+        '''
+        return self.setTransform(transform @ self._transform)
+
+    def translate(self, vector):
+        return self.setTransform(self._transform.translate(vector))
+
+    def rotate(self, angle, axis='z', center=None):
+        return self.setTransform(
+            self._transform.rotate(angle, axis, center)
+        )
+
+    def mirror(self, normal, point=None):
+        return self.setTransform(self._transform.mirror(normal, point))
+
+    def scale(self, factor, center=None):
+        return self.setTransform(self._transform.scale(factor, center))
+
     def setStartingPoint(self, sPoint):
-        self.x = self.x + sPoint[0]
-        self.y = self.y + sPoint[1]
-        self.z = self.z + sPoint[2]
+        '''
+        Moves curve by sPoint vector (see translate).
+        '''
+        self.translate(sPoint[:3])
 
 
 class ParametricCurve(ABC):
 
     '''
     Class with methods for calculating derivatives of curve.
+    Derivatives are kept in curve's (3, n) derivatives block.
     '''
 
+    __slots__ = ()
+
+    dx = _LazyRow('_derivatives', 0, '_buildDerivative')
+    dy = _LazyRow('_derivatives', 1, '_buildDerivative')
+    dz = _LazyRow('_derivatives', 2, '_buildDerivative')
+
     @abstractclassmethod
     def _calcDerivative(self):
         raise NotImplementedError
 
+    def _buildDerivative(self):
+        self._calcDerivative()
+
+    def _ensureDerivative(self):
+        if getattr(self, '_derivatives', None) is None:
+            self._runBuilder('_buildDerivative')
+
+    def _setDerivatives(self, derivatives):
+        self._derivatives = np.ascontiguousarray(
+            derivatives, dtype=self._dtype
+        )
+
+    def _derivativeFuncs(self):
+        '''
+        Returns tuple of x, y, z funcs and their first and second
+        derivatives funcs (None when derivatives are not known).
+        '''
+        raise NotImplementedError
+
+    def evaluate(self, t, order=0, outOfRange='raise'):
+        '''
+        Returns (3, len(t)) array of curve points (order 0) or their
+        first or second derivatives in array of real t parameters
+        (scalar t gives [x, y, z], (3,) + t.shape array for other
+        shapes). Closed forms are used when known, cached interpolants
+        of composed curves otherwise.
+
+        outOfRange tells what to do with t outside of returnParamRange:
+
+            'raise'         raise ValueError
+            'clip'          use nearest end of range
+            'extrapolate'   continue closed forms (or interpolants)
+            'nan'           return nan
+        '''
+        if order not in (0, 1, 2):
+            raise ValueError('order must be 0, 1 or 2')
+        if outOfRange not in _OUT_OF_RANGE:
+            raise ValueError('unknown outOfRange: {}'.format(outOfRange))
+
+        t = np.asarray(t, dtype=float)
+        flat = t.ravel()
+        outside = None
+        if outOfRange != 'extrapolate':
+            tmin, tmax = self.returnParamRange()
+            outside = (flat < tmin) | (flat > tmax)
+            if not outside.any():
+                outside = None
+            elif outOfRange == 'raise':
+                raise ValueError('t out of parameter range [{}, {}]'.format(
+                    tmin, tmax
+                ))
+            else:
+                flat = np.clip(flat, tmin, tmax)
+
+        result = self._evaluate(flat, order)
+        if order == 0:
+            result = self._transform.applyPoints(result)
+        else:
+            result = self._transform.applyVectors(result)
+        if outside is not None and outOfRange == 'nan':
+            result = np.asarray(result, dtype=float)
+            result[:, outside] = np.nan
+        return result.reshape((3,) + t.shape)
+
+    def _evaluate(self, t, order):
+        '''
+        evaluate for 1D array of t, without range checks
+        and transform.
+        '''
+        if order == 0:
+            return self._evalParameters(t)
+        funcs, dfuncs, ddfuncs = self._derivativeFuncs()
+        given = (dfuncs, ddfuncs)[order - 1] or (None, None, None)
+        return np.array([
+            _evalDerivative(func, dfunc, t, order, _DX)
+            for func, dfunc in zip(funcs, given)
+        ])
+
+    def returnEnds(self):
+        '''
+        Returns first point, last point, first derivative and last
+        derivative of curve, from its closed form when known (without
+        calculating its arrays).
+        '''
+        t = np.asarray(self.returnParamRange(), dtype=float)
+        points, derivatives = self.evaluate(t), self.evaluate(t, 1)
+        return (
+            points[:, 0], points[:, 1], derivatives[:, 0], derivatives[:, 1]
+        )
+
+    def returnSecondDerivatives(self):
+        '''
+        Returns (3, n) array of second derivatives in every point
+        of t parameter (analytic or spline ones when known, gradient
+        of first derivatives otherwise).
+        '''
+        self._ensureDerivative()
+        try:
+            funcs, _, ddfuncs = self._derivativeFuncs()
+        except NotImplementedError:
+            funcs, ddfuncs = None, None
+        ddfuncs = ddfuncs or (None, None, None)
+        if funcs is None or not all(
+            ddfunc is not None or hasattr(func, 'derivative')
+            for func, ddfunc in zip(funcs, ddfuncs)
+        ):
+            return np.gradient(self._derivatives, self.t, axis=1)
+
+        t = np.asarray(self.t, dtype=float)
+        return self._transform.applyVectors(self._evaluate(t, 2))
+
+    def returnDynamics(self, v0=0.0, friction=0.0, **kwargs):
+        '''
+        Returns structured array with arc length, curvature, torsion,
+        speed and g-forces in every point of curve, see rideDynamics.
+        '''
+        self._ensureParameters()
+        self._ensureDerivative()
+        return rideDynamics(
+            self._points, self._derivatives, self.returnSecondDerivatives(),
+            t=self.t, v0=v0, friction=friction, **kwargs
+        )
+
+    def returnJointReport(self, factor=1.5, rtol=1e-6):
+        '''
+        Returns structured array with continuity checks of every
+        segment joint of curve, see jointContinuity.
+        '''
+        self._ensureParameters()
+        try:
+            offsets = self.returnSegmentOffsets()
+        except AttributeError:
+            offsets = None
+        if offsets is None:
+            offsets = (0, len(self.t))
+
+        try:
+            self._ensureDerivative()
+            d1, d2 = self._derivatives, self.returnSecondDerivatives()
+        except NotImplementedError:
+            d1, d2 = None, None
+        return jointContinuity(self._points, offsets, d1, d2, factor, rtol)
+
+    def returnFrenetFrames(self):
+        '''
+        Returns tuple of (n, 3) arrays with frenet's p, n, b
+        unit vectors in every point of t parameter.
+        '''
+        t = np.asarray(self.t, dtype=float)
+        d1, d2 = (
+            self._transform.applyVectors(self._evaluate(t, order))
+            for order in (1, 2)
+        )
+        return framesFromDerivatives(d1.T, d2.T)
+
+    def returnRotationMinimizingFrames(self, normal=None):
+        '''
+        Returns tuple of (n, 3) arrays with p, n, b unit vectors of
+        rotation minimizing frames in every point of curve, first n
+        is vertical by default (see rotationMinimizingFrames). n can
+        be used as carUp of returnDynamics.
+        '''
+        self._ensureParameters()
+        self._ensureDerivative()
+        return rotationMinimizingFrames(
+            self._points.T, self._derivatives.T, normal
+        )
+
     @numpize
     def gimmeDerivative(self, t):
         return [
@@ -101,6 +855,8 @@ class NoramlizedCurve(object):
     Class with methods for returing unit vectors.
     '''
 
+    __slots__ = ()
+
     def gimmeDerivativeUnitVector(self, t):
 
         vector = np.array(self.gimmeDerivative(t))
@@ -4,8 +4,10 @@ from .simplecurves import (
 from .complexcurves import (
     SingleLoop, DoubleLoop, Hill, TransitionHelix
 )
+from .track import Track
 
 __all__ = [
     'HelixCircleParam', 'InvHelixCircleParam', 'Line',
-    'SingleLoop', 'DoubleLoop', 'Hill', 'TransitionHelix'
+    'SingleLoop', 'DoubleLoop', 'Hill', 'TransitionHelix',
+    'Track'
 ]
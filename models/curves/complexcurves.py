@@ -1,38 +1,250 @@
+from functools import partial
+
 from rollerpy.models.curves.simplecurves import (
     HelixCircleParam,
     InvHelixCircleParam
 )
 from rollerpy.models.curve import Curve, ParametricCurve, NoramlizedCurve
-from rollerpy.funcs import trackTransitonCurve, curveByCurve
+from rollerpy.funcs import (
+    trackTransitonCurve, trackTransitonCurves, curveByCurve, joinSegments,
+    jointContinuity,
+    stage, transitionPieces, PiecewiseCurve, splitSpline
+)
 
 import numpy as np
-from scipy.interpolate import CubicSpline
-from scipy.misc import derivative
 
 
 _PI = np.pi
 
 
-class NumericalDerivative(object):
+def _cubicSpline(t, values, axis=0):
+    # scipy.interpolate is imported on first fit
+    # to keep import of curves fast
+    from scipy.interpolate import CubicSpline
+    return CubicSpline(t, values, axis=axis)
 
-    def _calcParam_t(self):
+
+def _sameValues(a, b):
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(map(_sameValues, a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(
+            _sameValues(a[key], b[key]) for key in a
+        )
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.array_equal(a, b)
+    if isinstance(a, Curve) or isinstance(b, Curve):
+        return _samePiece(a, b)
+    return type(a) is type(b) and a == b
+
+
+def _samePiece(a, b):
+    '''
+    Returns True when pieces (TransitionPieces or curves)
+    have the same closed form.
+    '''
+    if a is b:
+        return True
+    if isinstance(a, Curve):
+        return (
+            type(a) is type(b) and a._transform == b._transform
+            and _sameValues(a.returnParameters(), b.returnParameters())
+        )
+    return a == b
+
+
+def _pieceEvaluate(piece):
+    '''
+    Returns evaluate(u, order) func of piece, curves are evaluated
+    with their transform and without range checks.
+    '''
+    if isinstance(piece, Curve):
+        return partial(piece.evaluate, outOfRange='extrapolate')
+    return piece.evaluate
+
+
+def _pieceSamples(piece):
+    if isinstance(piece, Curve):
+        return len(piece.t)
+    return piece.n
+
+
+class NumericalDerivative(Curve):
+
+    '''
+    Curve composed from segments. When closed forms of segments are
+    known (_calcPieces), derivatives are evaluated exactly from them,
+    otherwise from one cubic spline fitted to all axes of points.
+    '''
+
+    __slots__ = ('_interpolant',)
+
+    def _buildParameters(self):
+        self._calcParameters()
+        self._calcParam_t()
+
+    def _paramRange(self):
         try:
-            self.t = np.linspace(0, self._tparam_max, len(self.x))
+            return (0, self._tparam_max)
         except AttributeError:
-            self.t = np.linspace(0, 1, len(self.x))
+            return (0, 1)
+
+    def _calcParam_t(self):
+        self.t = np.linspace(*self._paramRange(), len(self.x))
+
+    def _calcPieces(self):
+        '''
+        Returns list of segments closed forms (TransitionPieces
+        and ParametricCurves) or None when they are not known.
+        '''
+        return None
+
+    def _fitInterpolant(self):
+        self._ensureParameters()
+        name = '{}._fitInterpolant'.format(type(self).__name__)
+        with stage(name, self, points=len(self.t)):
+            pieces = self._calcPieces()
+            if pieces is None:
+                self._interpolant = _cubicSpline(
+                    self.t, self._localBlock('_points'), axis=1
+                )
+                return
+
+            # segments share joints, last one ends at last point
+            offsets = self.returnSegmentOffsets()
+            stops = offsets[1:].copy()
+            stops[-1] -= 1
+            self._interpolant = PiecewiseCurve(
+                [_pieceEvaluate(piece) for piece in pieces],
+                [piece.returnParamRange() for piece in pieces],
+                self.t[offsets[:-1]], self.t[stops]
+            )
+
+    def _ensureInterpolant(self):
+        if not hasattr(self, '_interpolant'):
+            self._fitInterpolant()
+        return self._interpolant
+
+    def _evaluate(self, t, order):
+        if order == 0:
+            return self._evalParameters(t)
+        return self._ensureInterpolant()(t, order)
 
     def _calcDerivative(self):
-        self._xCubicFunc = CubicSpline(self.t, self.x)
-        self._yCubicFunc = CubicSpline(self.t, self.y)
-        self._zCubicFunc = CubicSpline(self.t, self.z)
+        self._setDerivatives(self._evaluate(self.t, 1))
+
+    def _derivativeFuncs(self):
+        interpolant = self._ensureInterpolant()
+        if isinstance(interpolant, PiecewiseCurve):
+            return interpolant.axisFuncs()
+        # frenetFrames uses derivatives of splines directly
+        return (splitSpline(interpolant), None, None)
+
+    def _evalParameters(self, t):
+        return self._ensureInterpolant()(t)
+
+    def returnJointReport(self, factor=1.5, rtol=1e-6):
+        '''
+        Returns structured array with continuity checks of every
+        segment joint of curve (see jointContinuity), gaps between
+        segments are taken from their closed forms when known.
+        '''
+        report = super().returnJointReport(factor, rtol)
+        pieces = self._calcPieces()
+        if pieces is None or len(pieces) != report.size + 1:
+            return report
+
+        ends = np.array([
+            piece.evaluate(np.asarray(piece.returnParamRange(), dtype=float))
+            for piece in pieces
+        ])
+        gaps = np.linalg.norm(self._transform.applyVectors(
+            (ends[1:, :, 0] - ends[:-1, :, 1]).T
+        ), axis=0)
+        report['gap'] = gaps
+        report['c0'] &= gaps <= rtol*np.ptp(self._points, axis=1).max()
+        return report
+
+    def setParameters(self, **changes):
+        '''
+        Changes constructor parameters of curve. When curve is already
+        calculated and closed forms of its segments are known, only
+        segments which closed form changed (and derivatives in them)
+        are calculated again, the rest of arrays is kept.
+        Otherwise the whole curve is calculated again on next access.
+        '''
+        edited = self._edited(changes)
+        changed = self._changedSegments(edited)
+        if changed is None:
+            return super().setParameters(**changes)
+
+        name = '{}.setParameters'.format(type(self).__name__)
+        with stage(name, self) as record:
+            self._adopt(edited, keep=('_offsets',))
+            self._invalidate()
+            # interpolant is in curve's own coordinates,
+            # placed copies of blocks are changed in the same samples
+            derivatives = hasattr(self, '_derivativesBlock')
+            interpolant = self._ensureInterpolant()
+            offsets = self._offsets
+            for k in changed:
+                segment = slice(offsets[k], offsets[k + 1])
+                t = self.t[segment]
+                self._writeSamples('_points', segment, interpolant(t))
+                if derivatives:
+                    self._writeSamples(
+                        '_derivatives', segment, interpolant(t, 1)
+                    )
+            if record is not None:
+                record.points = int(sum(
+                    offsets[k + 1] - offsets[k] for k in changed
+                ))
+        return self
+
+    def _changedSegments(self, edited):
+        '''
+        Returns indexes of segments which closed form differs in edited
+        curve, or None when curve has to be calculated again
+        (it is not calculated yet, segments closed forms are not known
+        or numbers of samples changed).
+        '''
+        if getattr(self, '_points', None) is None:
+            return None
+        pieces, editedPieces = self._calcPieces(), edited._calcPieces()
+        if (
+            pieces is None or editedPieces is None
+            or len(pieces) != len(editedPieces)
+        ):
+            return None
+
+        changed = [
+            k for k, (piece, editedPiece) in enumerate(
+                zip(pieces, editedPieces)
+            )
+            if not _samePiece(piece, editedPiece)
+        ]
+        # every segment but the last one shares its last sample
+        last = len(pieces) - 1
+        owned = np.diff(self._offsets)
+        for k in changed:
+            if _pieceSamples(editedPieces[k]) - (k < last) != owned[k]:
+                return None
+        return changed
 
-        self.dx = self._xCubicFunc(self.t, 1)
-        self.dy = self._yCubicFunc(self.t, 1)
-        self.dz = self._zCubicFunc(self.t, 1)
+    def _dropIntermediates(self):
+        super()._dropIntermediates()
+        if hasattr(self, '_interpolant'):
+            del self._interpolant
 
 
 class SingleLoop(NumericalDerivative, Curve, ParametricCurve):
 
+    __slots__ = (
+        '_lambdaParam', '_A', '_B', '_lw', '_h', '_l1', '_width_param',
+        '_single_e_n', '_slopeCoeff', '_helix', '_beginPoint',
+        '_slopeVector', '_offsets'
+    )
+
     def __init__(
         self, h, A, B, lw, width_param=0.5, single_e_n=50,
         slopeCoeffStart=9.5, slopeCoeffEnter=2
@@ -57,125 +269,120 @@ class SingleLoop(NumericalDerivative, Curve, ParametricCurve):
             B=B,
             C=width_param,
             n=single_e_n,
-            initialPosition=[self._l1, 0, h],
             tmin=(1/5)*np.pi,
             tmax=(4/5)*np.pi
-        )
+        ).translate([self._l1, 0, h])
 
         self._beginPoint = [0, -2*self._width_param, 0]
-        self._endPoint = [
-            self._l1 + self._lw + self._B,
-            2*width_param+self._helix.returnLastPoint()[1],
-            0
-        ]
         # self._slopeVector = [self._lambdaParam, -2*width_param, 0]
         self._slopeVector = [self._lambdaParam, 0, 0]
 
-        self._calcParameters()
-        self._calcParam_t()
-        self._calcDerivative()
-
-    def _calcParameters(self):
-
-        xt1, yt1, zt1 = trackTransitonCurve(
-            self._beginPoint, self._slopeVector,
-            self._helix.returnFirstPoint(),
-            np.array(self._helix.returnFirstDerivative())*self._slopeCoeff,
-            n=self._single_e_n
+    def returnSegmentOffsets(self):
+        self._ensureParameters()
+        return self._offsets
+
+    def _loopEndPoint(self):
+        '''
+        Returns end point of transition curve after helix.
+        '''
+        last = self._helix.returnEnds()[1]
+        return [self._l1 + self._lw + self._B, 2*self._width_param+last[1], 0]
+
+    def _transitionControls(self):
+        '''
+        Returns start points, start slopes, end points and end slopes
+        of transition curves before and after helix.
+        '''
+        first, last, dfirst, dlast = self._helix.returnEnds()
+
+        return (
+            [self._beginPoint, last],
+            [self._slopeVector, dlast*self._slopeCoeff],
+            [first, self._loopEndPoint()],
+            [dfirst*self._slopeCoeff, self._slopeVector]
         )
 
-        xt2, yt2, zt2 = trackTransitonCurve(
-            self._helix.returnLastPoint(),
-            np.array(self._helix.returnLastDerivative())*self._slopeCoeff,
-            self._endPoint, self._slopeVector,
-            n=self._single_e_n
+    def _calcSegments(self):
+        '''
+        Returns list with transition curve, helix
+        and second transition curve of loop.
+        '''
+        transitions = trackTransitonCurves(
+            *self._transitionControls(), n=self._single_e_n
         )
 
-        self.x = np.append(
-            xt1[:-1], np.append(
-                self._helix.returnXarray()[:-1], xt2
-            )
-        )
-        self.y = np.append(
-            yt1[:-1], np.append(
-                self._helix.returnYarray()[:-1], yt2
-            )
-        )
-        self.z = np.append(
-            zt1[:-1], np.append(
-                self._helix.returnZarray()[:-1], zt2
-            )
+        return [transitions[0].T, self._helix, transitions[1].T]
+
+    def _calcPieces(self):
+        first, second = transitionPieces(
+            *self._transitionControls(), n=self._single_e_n
         )
+        return [first, self._helix, second]
 
-    def _calcDerivative(self):
-        super()._calcDerivative()
+    def _calcParameters(self):
+        points, self._offsets = joinSegments(self._calcSegments())
+        self._setPoints(points)
 
 
 class DoubleLoop(SingleLoop):
 
-    def _calcParameters(self):
-        super()._calcParameters()
+    __slots__ = ('_invhelix', '_endOfSecondLoop', '_slopeVectorEnd')
 
+    def _secondTransitionControls(self):
+        '''
+        Returns controls of transition curves around second,
+        inverted helix.
+        '''
         self._invhelix = InvHelixCircleParam(
             A=self._A,
             B=self._B,
             C=self._width_param,
             n=self._single_e_n,
-            initialPosition=[self._l1*3, 0, self._h],
             tmin=(1/5)*np.pi,
             tmax=(4/5)*np.pi
-        )
+        ).translate([self._l1*3, 0, self._h])
 
         self._endOfSecondLoop = [
-            (self._l1+self._lw+self._B)*2, self.returnFirstPoint()[1], 0
+            (self._l1+self._lw+self._B)*2, self._beginPoint[1], 0
         ]
         self._slopeVectorEnd = [
             self._lambdaParam, 2*self._width_param, 0
         ]
 
-        xt1, yt1, zt1 = trackTransitonCurve(
-            self.returnLastPoint(),
-            self._slopeVector,
-            self._invhelix.returnFirstPoint(),
-            np.array(self._invhelix.returnFirstDerivative())*self._slopeCoeff,
-            n=self._single_e_n
+        first, last, dfirst, dlast = self._invhelix.returnEnds()
+        return (
+            [self._loopEndPoint(), last],
+            [self._slopeVector, dlast*self._slopeCoeff],
+            [first, self._endOfSecondLoop],
+            [dfirst*self._slopeCoeff, self._slopeVectorEnd]
         )
 
-        xt2, yt2, zt2 = trackTransitonCurve(
-            self._invhelix.returnLastPoint(),
-            np.array(self._invhelix.returnLastDerivative())*self._slopeCoeff,
-            self._endOfSecondLoop,
-            self._slopeVectorEnd,
-            n=self._single_e_n
-        )
+    def _calcSegments(self):
+        segments = super()._calcSegments()
 
-        self.x = np.append(
-            self.x[:-1], np.append(
-                xt1[:-1], np.append(
-                    self._invhelix.returnXarray()[:-1], xt2
-                )
-            )
+        transitions = trackTransitonCurves(
+            *self._secondTransitionControls(), n=self._single_e_n
         )
 
-        self.y = np.append(
-            self.y[:-1], np.append(
-                yt1[:-1], np.append(
-                    self._invhelix.returnYarray()[:-1], yt2
-                )
-            )
-        )
+        return segments + [
+            transitions[0].T, self._invhelix, transitions[1].T
+        ]
 
-        self.z = np.append(
-            self.z[:-1], np.append(
-                zt1[:-1], np.append(
-                    self._invhelix.returnZarray()[:-1], zt2
-                )
-            )
+    def _calcPieces(self):
+        pieces = super()._calcPieces()
+        first, second = transitionPieces(
+            *self._secondTransitionControls(), n=self._single_e_n
         )
+        return pieces + [first, self._invhelix, second]
 
 
 class Hill(NumericalDerivative, Curve, ParametricCurve, NoramlizedCurve):
 
+    __slots__ = (
+        '_startingPoint', '_middlePoint', '_endingPoint', '_startingSlope',
+        '_middleSlope', '_endSlope', '_single_e_n', '_offsets'
+    )
+
     def __init__(
         self,
         l_e1, l_e2, h,
@@ -206,39 +413,48 @@ class Hill(NumericalDerivative, Curve, ParametricCurve, NoramlizedCurve):
         ]
 
         self._single_e_n = single_e_n
-        self._calcParameters()
-        self._calcParam_t()
-        self._calcDerivative()
 
-    def _calcParameters(self):
+    def returnSegmentOffsets(self):
+        self._ensureParameters()
+        return self._offsets
 
-        x1, y1, z1 = trackTransitonCurve(
-            self._startingPoint,
-            self._startingSlope,
-            self._middlePoint,
-            self._middleSlope,
-            n=self._single_e_n
+    def _transitionControls(self):
+        return (
+            [self._startingPoint, self._middlePoint],
+            [self._startingSlope, self._middleSlope],
+            [self._middlePoint, self._endingPoint],
+            [self._middleSlope, self._endSlope]
         )
-        x2, y2, z2 = trackTransitonCurve(
-            self._middlePoint,
-            self._middleSlope,
-            self._endingPoint,
-            self._endSlope,
-            n=self._single_e_n
+
+    def _calcPieces(self):
+        return transitionPieces(
+            *self._transitionControls(), n=self._single_e_n
+        )
+
+    def _calcParameters(self):
+
+        transitions = trackTransitonCurves(
+            *self._transitionControls(), n=self._single_e_n
         )
 
         # every parameter without last element of vector
         # to make possible to interpolate vectors in future
-        self.x = np.append(x1[:-1], x2)
-        self.y = np.append(y1[:-1], y2)
-        self.z = np.append(z1[:-1], z2)
-
-    def _calcDerivative(self):
-        super()._calcDerivative()
+        points, self._offsets = joinSegments(
+            [transitions[0].T, transitions[1].T]
+        )
+        self._setPoints(points)
 
 
 class TransitionHelix(NumericalDerivative, Curve, ParametricCurve):
 
+    __slots__ = (
+        '_diamater', '_radius', '_percentage', '_lambdas', '_lambdae',
+        '_single_n', '_final_n', '_hend', '_hstart', '_helixDict',
+        '_dhelixDict', '_helixRadius', '_helixParam', '_tspace',
+        '_helixVectors', '_extractor', '_offsets', '_ctx', '_cty', '_ctz',
+        '_tparam', '_helixOnCurve', '_cubicSplines', '_finalparam'
+    )
+
     def __init__(
         self, percentage, lambdas, lambdae,
         helix_radius=45, helix_param=5,
@@ -262,20 +478,14 @@ class TransitionHelix(NumericalDerivative, Curve, ParametricCurve):
             'z': lambda t: t*0
         }
         self._dhelixDict = {
-            'x': lambda t: derivative(
-                self._helixDict['x'], t, dx=10**(-3), n=1),
-            'y': lambda t: derivative(
-                self._helixDict['y'], t, dx=10**(-3), n=1),
-            'z': lambda t: derivative(
-                self._helixDict['z'], t, dx=10**(-3), n=1),
+            'x': lambda t: -self._radius*np.sin(t-0.5*_PI),
+            'y': lambda t: self._radius*np.cos(t-0.5*_PI),
+            'z': lambda t: t*0
         }
 
         # helix on curve parameters
         self._helixRadius = helix_radius
         self._helixParam = helix_param
-        self._calcParameters()
-        self._calcParam_t()
-        self._calcDerivative()
 
     # TODO: create _calcParameters method
     def _calcCircleWithTran(self):
@@ -343,26 +553,25 @@ class TransitionHelix(NumericalDerivative, Curve, ParametricCurve):
                 else:
                     self._extractor = -1
 
-        self._ctx = np.append(
-            np.append(
-                xt1[:self._extractor],
-                self._helixVectors['x'][:self._extractor]
-            ), xt2
-        )
-        self._cty = np.append(
-            np.append(
-                yt1[:self._extractor],
-                self._helixVectors['y'][:self._extractor]
-            ), yt2
-        )
-        self._ctz = np.append(
-            np.append(
-                zt1[:self._extractor],
-                self._helixVectors['z'][:self._extractor]
-            ), zt2
+        points, self._offsets = joinSegments(
+            [
+                (xt1[:self._extractor],
+                 yt1[:self._extractor],
+                 zt1[:self._extractor]),
+                (self._helixVectors['x'][:self._extractor],
+                 self._helixVectors['y'][:self._extractor],
+                 self._helixVectors['z'][:self._extractor]),
+                (xt2, yt2, zt2)
+            ],
+            shareJoints=False
         )
+        self._ctx, self._cty, self._ctz = points
 
-    def _calcParameters(self):
+    def _calcControlCurve(self):
+        '''
+        Calculates base curve splines and helix funcs,
+        final curve is helix on base curve.
+        '''
         self._calcCircleWithTran()
 
         self._tparam = np.linspace(0, 1, len(self._ctx))
@@ -375,18 +584,49 @@ class TransitionHelix(NumericalDerivative, Curve, ParametricCurve):
                 self._helixParam*(t+0.5*_PI)
             )
         )
-        self._cubicSplines = (
-            CubicSpline(self._tparam, self._ctx),
-            CubicSpline(self._tparam, self._cty),
-            CubicSpline(self._tparam, self._ctz)
-        )
+        self._cubicSplines = splitSpline(_cubicSpline(
+            self._tparam, np.array([self._ctx, self._cty, self._ctz]),
+            axis=1
+        ))
+
+    def _calcParameters(self):
+        self._calcControlCurve()
 
         self._finalparam = np.linspace(0, 1, self._final_n)
         self.x, self.y, self.z = curveByCurve(
             self._finalparam, self._cubicSplines, self._helixOnCurve
         )
 
+    def _evalParameters(self, t):
+        if not hasattr(self, '_cubicSplines'):
+            self._calcControlCurve()
+        return np.array(
+            curveByCurve(t, self._cubicSplines, self._helixOnCurve)
+        )
+
     def _calcDerivative(self):
         self._calcParam_t()
         super()._calcDerivative()
 
+    def returnJointReport(self, factor=1.5, rtol=1e-6):
+        '''
+        Returns structured array with continuity checks of joints
+        of base curve (transition curves and circle) which helix
+        is wound around, see jointContinuity.
+        '''
+        if not hasattr(self, '_ctx'):
+            self._calcCircleWithTran()
+        return jointContinuity(
+            (self._ctx, self._cty, self._ctz), self._offsets,
+            factor=factor, rtol=rtol
+        )
+
+    def _dropIntermediates(self):
+        super()._dropIntermediates()
+        for name in (
+            '_tspace', '_helixVectors', '_ctx', '_cty', '_ctz',
+            '_tparam', '_cubicSplines', '_finalparam'
+        ):
+            if hasattr(self, name):
+                delattr(self, name)
+
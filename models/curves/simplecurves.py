@@ -4,6 +4,8 @@ import numpy as np
 
 class HelixCircleParam(Curve, ParametricCurve, NoramlizedCurve):
 
+    __slots__ = ('A', 'B', 'C', 'tmin', 'tmax', '_n', 'x0', 'y0', 'z0')
+
     def __init__(
         self, A, B, C=1, tmin=0, tmax=np.pi, n=100, initialPosition=[0, 0, 0]
     ):
@@ -13,15 +15,11 @@ class HelixCircleParam(Curve, ParametricCurve, NoramlizedCurve):
         self.C = C
         self.tmin = tmin
         self.tmax = tmax
+        self._n = n
 
         # Initial positions
         self._setInitialPosition(initialPosition)
 
-        # Calculations
-        self.t = np.linspace(self.tmin, self.tmax, n)
-        self._calcParameters()
-        self._calcDerivative()
-
     def _setInitialPosition(self, initialPosition):
 
         self.x0 = initialPosition[0]
@@ -38,9 +36,30 @@ class HelixCircleParam(Curve, ParametricCurve, NoramlizedCurve):
         self.dy = self.t*0 + self.C
         self.dz = self.A*np.cos(self.t)
 
+    def _derivativeFuncs(self):
+        return (
+            (
+                lambda t: self.B*np.cos(t) + self.x0,
+                lambda t: self.C*t + self.y0 - self.tmin,
+                lambda t: self.A*np.sin(t) + self.z0
+            ),
+            (
+                lambda t: -1*self.B*np.sin(t),
+                lambda t: t*0 + self.C,
+                lambda t: self.A*np.cos(t)
+            ),
+            (
+                lambda t: -1*self.B*np.cos(t),
+                lambda t: t*0,
+                lambda t: -1*self.A*np.sin(t)
+            )
+        )
+
 
 class InvHelixCircleParam(HelixCircleParam):
 
+    __slots__ = ()
+
     def _calcParameters(self):
         self.x = self.B*np.cos(self.t) + self.x0
         self.y = -self.C*(self.t - self.tmax) + self.y0 - self.tmin
@@ -51,9 +70,23 @@ class InvHelixCircleParam(HelixCircleParam):
         self.dy = self.t*0 - self.C
         self.dz = self.A*np.cos(self.t)
 
+    def _derivativeFuncs(self):
+        funcs, dfuncs, ddfuncs = super()._derivativeFuncs()
+        return (
+            (
+                funcs[0],
+                lambda t: -self.C*(t - self.tmax) + self.y0 - self.tmin,
+                funcs[2]
+            ),
+            (dfuncs[0], lambda t: t*0 - self.C, dfuncs[2]),
+            ddfuncs
+        )
+
 
 class Line(Curve, ParametricCurve, NoramlizedCurve):
 
+    __slots__ = ('_point1', '_point2', '_v', 'tmin', 'tmax', '_n')
+
     def __init__(self, point1, point2, tmin=0, tmax=1, n=100):
 
         self._point1 = point1
@@ -65,10 +98,9 @@ class Line(Curve, ParametricCurve, NoramlizedCurve):
             (point2[2] - point1[2])/tmax
         ]
 
-        self.t = np.linspace(tmin, tmax, n)
-
-        self._calcParameters()
-        self._calcDerivative()
+        self.tmin = tmin
+        self.tmax = tmax
+        self._n = n
 
     def _calcParameters(self):
         self.x = self._point1[0] + self.t*self._v[0]
@@ -79,3 +111,19 @@ class Line(Curve, ParametricCurve, NoramlizedCurve):
         self.dx = 0*self.t + (self._point2[0] - self._point1[0])/self.t[-1]
         self.dy = 0*self.t + (self._point2[1] - self._point1[1])/self.t[-1]
         self.dz = 0*self.t + (self._point2[2] - self._point1[2])/self.t[-1]
+
+    def _derivativeFuncs(self):
+        return (
+            tuple(
+                (lambda t, i=i: self._point1[i] + t*self._v[i])
+                for i in range(3)
+            ),
+            tuple(
+                (lambda t, i=i: 0*t + self._v[i])
+                for i in range(3)
+            ),
+            tuple(
+                (lambda t: 0*t)
+                for i in range(3)
+            )
+        )
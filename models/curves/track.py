@@ -0,0 +1,94 @@
+from rollerpy.models.curve import Curve, ParametricCurve, NoramlizedCurve
+from rollerpy.models.curves.complexcurves import NumericalDerivative
+from rollerpy.funcs import joinSegments
+
+
+class _TrackSegments(list):
+
+    '''
+    Segments owned by track, they are not copied again
+    when edited track is created from them.
+    '''
+
+
+class Track(NumericalDerivative, Curve, ParametricCurve, NoramlizedCurve):
+
+    '''
+    Track composed from ordered list of segments (Curve objects or
+    [x, y, z] vectors). Every segment is written once into one
+    contiguous buffer, last point of every segment but the last one
+    is dropped as it is shared with the next segment. Segments are
+    copied, so later changes of given segment objects (e.g. their
+    transforms) do not change the track.
+    '''
+
+    __slots__ = ('_segments', '_shareJoints', '_offsets')
+
+    def __init__(self, segments, shareJoints=True):
+
+        if isinstance(segments, _TrackSegments):
+            self._segments = list(segments)
+        else:
+            self._segments = [
+                segment.copy() if isinstance(segment, Curve) else segment
+                for segment in segments
+            ]
+        self._shareJoints = shareJoints
+
+    def _calcParameters(self):
+        points, self._offsets = joinSegments(
+            self._segments, shareJoints=self._shareJoints
+        )
+        self._setPoints(points)
+
+    def _calcDerivative(self):
+        super()._calcDerivative()
+
+    def _calcPieces(self):
+        if not self._shareJoints or not all(
+            isinstance(segment, ParametricCurve) for segment in self._segments
+        ):
+            return None
+        return self._segments
+
+    def _dropIntermediates(self):
+        super()._dropIntermediates()
+        self._segments = [
+            segment._unbuilt() if isinstance(segment, Curve) else segment
+            for segment in self._segments
+        ]
+
+    def setSegment(self, i, segment):
+        '''
+        Replaces i-th segment. When it has the same number of samples,
+        only its part of track arrays is calculated again.
+        '''
+        segments = _TrackSegments(self._segments)
+        segments[i] = segment.copy() if isinstance(segment, Curve) else segment
+        return self.setParameters(segments=segments)
+
+    def setSegmentParameters(self, i, **changes):
+        '''
+        Changes constructor parameters of i-th segment (Curve object)
+        without changing the segment object itself.
+        '''
+        segments = _TrackSegments(self._segments)
+        segments[i] = self._segments[i].copy().setParameters(**changes)
+        return self.setParameters(segments=segments)
+
+    def returnParameters(self):
+        return {
+            'segments': _TrackSegments(self._segments),
+            'shareJoints': self._shareJoints
+        }
+
+    def returnSegments(self):
+        return self._segments
+
+    def returnSegmentOffsets(self):
+        self._ensureParameters()
+        return self._offsets
+
+    def returnSegmentSlice(self, i):
+        offsets = self.returnSegmentOffsets()
+        return slice(int(offsets[i]), int(offsets[i+1]))
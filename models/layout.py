@@ -0,0 +1,188 @@
+import json
+import os
+
+import numpy as np
+
+from rollerpy.funcs import AffineTransform
+from rollerpy.models import curves
+from rollerpy.models.store import _curveClass
+
+_CHUNK = 2**16
+_ALIGN = ('heading', 'tangent', 'position', 'none')
+_PLACEMENT = ('translate', 'rotate', 'mirror', 'scale')
+
+
+def loadLayout(path):
+    '''
+    Reads layout from .json or .toml file (see layoutCurves).
+    '''
+    if os.path.splitext(path)[1].lower() == '.toml':
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+        with open(path, 'rb') as layoutfile:
+            return tomllib.load(layoutfile)
+    with open(path) as layoutfile:
+        return json.load(layoutfile)
+
+
+def _layoutDict(layout):
+    if isinstance(layout, (str, os.PathLike)):
+        return loadLayout(os.fspath(layout))
+    return layout
+
+
+def _elementClass(name):
+    if ':' in name:
+        return _curveClass(name)
+    if name not in curves.__all__:
+        raise ValueError('unknown layout element: {}'.format(name))
+    return getattr(curves, name)
+
+
+def _placement(steps):
+    '''
+    Returns transform composed from list of {operation: arguments}
+    steps, dict arguments are keyword arguments of AffineTransform
+    operation, other value is its only argument.
+    '''
+    transform = AffineTransform()
+    for step in steps:
+        for operation, arguments in step.items():
+            if operation not in _PLACEMENT:
+                raise ValueError(
+                    'unknown placement: {}'.format(operation)
+                )
+            method = getattr(transform, operation)
+            if isinstance(arguments, dict):
+                transform = method(**arguments)
+            else:
+                transform = method(arguments)
+    return transform
+
+
+def _heading(vector):
+    return np.arctan2(vector[1], vector[0])
+
+
+def _alignment(align, start, tangent, point, direction):
+    '''
+    Returns transform which moves start of element (start point and
+    tangent) to point, turning it to direction as align tells.
+    '''
+    transform = AffineTransform()
+    if align == 'heading' and direction is not None and (
+        np.hypot(*tangent[:2]) > 0 and np.hypot(*direction[:2]) > 0
+    ):
+        transform = transform.rotate(
+            _heading(direction) - _heading(tangent), center=start
+        )
+    elif align == 'tangent' and direction is not None:
+        tangent = tangent/np.linalg.norm(tangent)
+        direction = direction/np.linalg.norm(direction)
+        axis = np.cross(tangent, direction)
+        sin, cos = np.linalg.norm(axis), np.dot(tangent, direction)
+        if sin > 0:
+            transform = transform.rotate(
+                np.arctan2(sin, cos), axis=axis, center=start
+            )
+        elif cos < 0:
+            transform = transform.rotate(np.pi, center=start)
+    return transform.translate(np.asarray(point) - start)
+
+
+def layoutCurves(layout):
+    '''
+    Yields placed curves of layout one by one. Layout is dict (or path
+    of .json or .toml file with it) like:
+
+        {
+            "start": {"point": [0, 0, 0], "tangent": [1, 0, 0]},
+            "align": "heading",
+            "elements": [
+                {"type": "Hill", "parameters": {...}, "repeat": 3},
+                {
+                    "type": "SingleLoop", "parameters": {...},
+                    "placement": [{"mirror": "y"}, {"scale": 1.5}],
+                    "align": "tangent"
+                }
+            ]
+        }
+
+    type is name of class from rollerpy.models.curves (or
+    'module:qualname' of other curve class) created with parameters,
+    repeat tells how many times element follows itself (1).
+    Element is placed by its placement steps (AffineTransform
+    operations with their arguments) and then moved to end of
+    previous element (or start point), by align (layout align,
+    'heading' by default):
+
+        'heading'   rotated around vertical axis to continue
+                    horizontal direction of previous end tangent
+        'tangent'   rotated to continue previous end tangent
+        'position'  only moved to previous end
+        'none'      not moved
+
+    Only the previous end point and tangent are kept
+    between elements.
+    '''
+    layout = _layoutDict(layout)
+    defaultAlign = layout.get('align', 'heading')
+    start = layout.get('start', {})
+    point = start.get('point')
+    direction = start.get('tangent')
+    if direction is not None:
+        direction = np.asarray(direction, dtype=float)
+
+    for element in layout['elements']:
+        curveClass = _elementClass(element['type'])
+        align = element.get('align', defaultAlign)
+        if align not in _ALIGN:
+            raise ValueError('unknown align: {}'.format(align))
+        placement = _placement(element.get('placement', ()))
+
+        for _ in range(element.get('repeat', 1)):
+            curve = curveClass(**element.get('parameters', {}))
+            curve.transform(placement)
+            first, last, tangent, lastTangent = curve.returnEnds()
+            if align != 'none' and point is not None:
+                alignment = _alignment(
+                    align, first, tangent, point, direction
+                )
+                curve.transform(alignment)
+                last = alignment.applyPoints(last.reshape(3, 1))[:, 0]
+                lastTangent = alignment.applyVectors(lastTangent)
+            point, direction = last, lastTangent
+            yield curve
+
+
+def layoutChunks(layout, chunk=_CHUNK):
+    '''
+    Yields (points, derivatives) tuples of (3, k) arrays, k at most
+    chunk, with consecutive samples of layout (see layoutCurves).
+    First sample of every element but the first one is skipped,
+    as it is end of previous element. Only one element is calculated
+    at a time, so memory does not grow with length of layout.
+
+    Derivatives are derivatives of every element in its own parameter.
+    Track of layoutTrack has the same points, but its derivatives are
+    in parameter of the whole track (they point the same way, their
+    length depends on number of samples of all elements).
+    '''
+    skip = 0
+    for curve in layoutCurves(layout):
+        curve._ensureParameters()
+        curve._ensureDerivative()
+        points, derivatives = curve._points, curve._derivatives
+        for begin in range(skip, points.shape[1], chunk):
+            stop = begin + chunk
+            yield (points[:, begin:stop], derivatives[:, begin:stop])
+        skip = 1
+
+
+def layoutTrack(layout):
+    '''
+    Returns Track with all placed curves of layout.
+    '''
+    return curves.Track(list(layoutCurves(layout)))
@@ -0,0 +1,224 @@
+import importlib
+import json
+import os
+
+import numpy as np
+
+from rollerpy.funcs import AffineTransform
+from rollerpy.models.curve import Curve, ParametricCurve
+
+_META = 'meta.json'
+_DATA = 'data.npy'
+_FORMAT = 2
+
+
+def _encode(value):
+    '''
+    Changing constructor parameter to json compatible value.
+    Curves are stored as their class, parameters and transform.
+    '''
+    if isinstance(value, Curve):
+        return {
+            '__curve__': '{}:{}'.format(
+                type(value).__module__, type(value).__qualname__
+            ),
+            'parameters': _encode(value.returnParameters()),
+            'transform': value.returnTransform().matrix.tolist()
+        }
+    if isinstance(value, dict):
+        return {str(key): _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _curveClass(name):
+    module, qualname = name.split(':')
+    return getattr(importlib.import_module(module), qualname)
+
+
+def _decode(value):
+    '''
+    Reverse of _encode, curves are created again.
+    '''
+    if isinstance(value, dict):
+        if '__curve__' in value:
+            curve = _curveClass(value['__curve__'])(
+                **_decode(value['parameters'])
+            )
+            return curve.setTransform(AffineTransform(value['transform']))
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def saveTrack(curve, path):
+    '''
+    Saves curve to path directory. t, points and derivatives are
+    stored as contiguous rows of one .npy array, constructor
+    parameters and segment offsets in json file.
+    '''
+    os.makedirs(path, exist_ok=True)
+
+    columns = ['t', 'x', 'y', 'z']
+    if isinstance(curve, ParametricCurve):
+        columns += ['dx', 'dy', 'dz']
+
+    data = np.lib.format.open_memmap(
+        os.path.join(path, _DATA), mode='w+',
+        dtype=curve._dtype, shape=(len(columns), len(curve.x))
+    )
+    for row, column in zip(data, columns):
+        row[:] = getattr(curve, column)
+    data.flush()
+    del data
+
+    try:
+        offsets = curve.returnSegmentOffsets().tolist()
+    except AttributeError:
+        offsets = None
+
+    meta = {
+        'format': _FORMAT,
+        'class': '{}:{}'.format(
+            type(curve).__module__, type(curve).__qualname__
+        ),
+        'parameters': _encode(curve.returnParameters()),
+        'transform': curve.returnTransform().matrix.tolist(),
+        'columns': columns,
+        'offsets': offsets
+    }
+    with open(os.path.join(path, _META), 'w') as metafile:
+        json.dump(meta, metafile)
+
+
+def loadTrack(path, mmap_mode='r'):
+    '''
+    Loads curve saved with saveTrack. Arrays are memory mapped,
+    so only accessed parts of them are read from disk.
+    '''
+    return StoredCurve(path, mmap_mode=mmap_mode)
+
+
+class StoredCurve(Curve, ParametricCurve):
+
+    '''
+    Curve loaded from disk. Arrays are views of memory mapped file.
+    '''
+
+    __slots__ = ('_path', '_meta', '_data', '_offsets', '_secondDerivatives')
+
+    def __init__(self, path, mmap_mode='r'):
+        self._path = path
+
+        with open(os.path.join(path, _META)) as metafile:
+            self._meta = json.load(metafile)
+        if self._meta.get('format') != _FORMAT:
+            raise ValueError(
+                '{} has store format {}, expected {}'.format(
+                    path, self._meta.get('format'), _FORMAT
+                )
+            )
+        self._data = np.load(
+            os.path.join(path, _DATA), mmap_mode=mmap_mode
+        )
+        self._offsets = None
+        self._secondDerivatives = None
+        if self._meta['offsets'] is not None:
+            self._offsets = np.array(self._meta['offsets'], dtype=np.intp)
+
+        # points and derivatives blocks are views of stored rows
+        self._dtype = self._data.dtype
+        self.t = self._data[0]
+        self._points = self._data[1:4]
+        if len(self._data) > 4:
+            self._derivatives = self._data[4:7]
+
+    def _calcParameters(self):
+        raise NotImplementedError('stored curve has no parameters to calc')
+
+    def _calcDerivative(self):
+        raise NotImplementedError('stored curve has no derivatives')
+
+    def _paramRange(self):
+        return (self.t[0], self.t[-1])
+
+    def _interpolate(self, rows, t):
+        '''
+        Linear interpolation of (3, n) rows in 1D array of t, outside
+        of stored t it continues with end chords.
+        '''
+        stored = self.t
+        idx = np.searchsorted(stored, t, side='right') - 1
+        np.clip(idx, 0, max(len(stored) - 2, 0), out=idx)
+        after = np.minimum(idx + 1, len(stored) - 1)
+        span = stored[after] - stored[idx]
+        weight = np.divide(
+            t - stored[idx], span,
+            out=np.zeros(len(t)), where=span > 0
+        )
+        first = rows[:, idx]
+        return first + (rows[:, after] - first)*weight
+
+    def _secondDerivativeRows(self):
+        if self._secondDerivatives is None:
+            self._ensureDerivative()
+            self._secondDerivatives = np.gradient(
+                self._localBlock('_derivatives'), self.t, axis=1
+            )
+        return self._secondDerivatives
+
+    def _evaluate(self, t, order):
+        if order == 0:
+            return self._interpolate(self._localBlock('_points'), t)
+        if order == 1:
+            self._ensureDerivative()
+            return self._interpolate(self._localBlock('_derivatives'), t)
+        # stored derivatives are linear between samples,
+        # so second ones are their gradient in samples
+        return self._interpolate(self._secondDerivativeRows(), t)
+
+    def _derivativeFuncs(self):
+        return tuple(
+            tuple(
+                (lambda t, axis=axis, order=order:
+                    self._evaluate(np.atleast_1d(t), order)[axis])
+                for axis in range(3)
+            )
+            for order in range(3)
+        )
+
+    def _evalParameters(self, t):
+        return self._evaluate(np.atleast_1d(t), 0)
+
+    def returnParameters(self):
+        return _decode(self._meta['parameters'])
+
+    def returnCurveClass(self):
+        return _curveClass(self._meta['class'])
+
+    def returnSegmentOffsets(self):
+        return self._offsets
+
+    def rebuild(self, arrays=False):
+        '''
+        Creates again original curve from stored parameters. With
+        arrays, stored t, points and derivatives (memory mapped) are
+        taken as its arrays instead of being calculated again.
+        '''
+        curve = self.returnCurveClass()(**self.returnParameters())
+        curve.setTransform(AffineTransform(self._meta['transform']))
+        if arrays:
+            curve._dtype = self._dtype
+            curve._attachArrays(
+                self.t, self._data[1:4],
+                self._data[4:7] if len(self._data) > 4 else None
+            )
+            if self._offsets is not None:
+                curve._offsets = self._offsets
+        return curve
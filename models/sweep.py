@@ -0,0 +1,98 @@
+import itertools
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+_worker = {}
+
+
+def sweepCases(grid, fixed=None):
+    '''
+    Returns list of constructor arguments dicts, one for every
+    combination of grid values (in order of grid keys).
+    '''
+    names = list(grid)
+    cases = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        case = dict(fixed or {})
+        case.update(zip(names, values))
+        cases.append(case)
+    return cases
+
+
+def _evalCase(curveClass, case, metrics, n):
+    curve = curveClass(**case)
+    if metrics is not None:
+        return [metric(curve) for metric in metrics]
+    return curve.sample(n)
+
+
+def _initWorker(name, shape, curveClass, metrics, n):
+    memory = shared_memory.SharedMemory(name=name)
+    _worker['memory'] = memory
+    _worker['output'] = np.ndarray(shape, dtype=float, buffer=memory.buf)
+    _worker['args'] = (curveClass, metrics, n)
+
+
+def _runCase(task):
+    i, case = task
+    curveClass, metrics, n = _worker['args']
+    _worker['output'][i] = _evalCase(curveClass, case, metrics, n)
+    return i
+
+
+def sweep(
+    curveClass, grid, fixed=None, metrics=None, n=100,
+    processes=None, progress=None
+):
+    '''
+    Builds curveClass for every combination of grid values
+    (dict of parameter name and values), fixed parameters are
+    passed to every build. Builds are spread over process pool.
+
+    With metrics (sequence of picklable funcs taking curve), returns
+    tuple of cases and (cases, metrics) array of their values.
+    Otherwise returns cases and (cases, 3, n) array of curves sampled
+    in n points. Results are written straight to shared memory and
+    ordered as cases. progress(done, total) is called after every case.
+    '''
+    cases = sweepCases(grid, fixed)
+    if metrics is not None:
+        shape = (len(cases), len(metrics))
+    else:
+        shape = (len(cases), 3, n)
+
+    if processes == 1:
+        output = np.empty(shape)
+        for i, case in enumerate(cases):
+            output[i] = _evalCase(curveClass, case, metrics, n)
+            if progress is not None:
+                progress(i + 1, len(cases))
+        return (cases, output)
+
+    memory = shared_memory.SharedMemory(
+        create=True, size=max(int(np.prod(shape))*8, 1)
+    )
+    processes = processes or os.cpu_count() or 1
+    # few tasks per process, so small builds don't wait for the pool
+    chunksize = max(1, len(cases)//(processes*4))
+    try:
+        with multiprocessing.Pool(
+            processes, initializer=_initWorker,
+            initargs=(memory.name, shape, curveClass, metrics, n)
+        ) as pool:
+            done = 0
+            for _ in pool.imap_unordered(
+                _runCase, enumerate(cases), chunksize=chunksize
+            ):
+                done += 1
+                if progress is not None:
+                    progress(done, len(cases))
+        output = np.ndarray(shape, dtype=float, buffer=memory.buf).copy()
+    finally:
+        memory.close()
+        memory.unlink()
+
+    return (cases, output)